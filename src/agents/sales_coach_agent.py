@@ -1,17 +1,586 @@
 """
 Sales Coach Agent using Azure AI Foundry.
 """
-import json
+import re
 import logging
 import asyncio
-from typing import Dict, Any
-from openai import AzureOpenAI
+import hashlib
+import time
+from collections import deque, OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, AsyncIterator, Deque, Optional
+import httpx
+import msgspec
+import numpy as np
+import openai
+import orjson
+import tiktoken
+from tenacity import (
+    retry, stop_after_attempt, wait_random_exponential,
+    retry_if_exception_type, before_sleep_log,
+)
 
-from src.config import config
-from src.models.report import SalesCoachingReport, RuleViolation, ImprovementItem, CriteriaScores
+from src.config import get_config
+from src.models.report import (
+    SalesCoachingReport, RuleViolation, ImprovementItem, CriteriaScores,
+    ScoresSection, FeedbackSection, RuleViolationsSection,
+)
+from src.models.report_fast import (
+    ScoresSectionStruct, FeedbackSectionStruct, RuleViolationsSectionStruct,
+    SCORES_DECODER, FEEDBACK_DECODER, RULE_VIOLATIONS_DECODER, to_report,
+)
 
 logger = logging.getLogger(__name__)
 
+# Static system prompts. Keep these byte-for-byte stable and put all per-call
+# data in the user message so Azure OpenAI can reuse the cached prompt prefix.
+COACHING_SCRIPT_SYSTEM_PROMPT = """You are a supportive sales coach providing feedback.
+
+Convert the sales coaching report you are given into a natural, conversational script that an AI avatar 
+will speak to the presenter. The script should be encouraging, specific, and actionable.
+
+Create a 60-90 second script with this structure:
+1. Warm opening with overall score
+2. Highlight 2-3 key strengths
+3. Discuss 2-3 main improvement areas with specific examples
+4. End with encouragement and 1-2 actionable next steps
+
+Make it conversational, supportive, and professional. Use "you" to address the presenter.
+Return ONLY the script text, no additional formatting or labels."""
+
+CUSTOMER_QUESTION_SYSTEM_PROMPT = """You are a curious potential customer listening to a sales presentation. 
+Based on what the salesperson just said, ask ONE brief, natural follow-up question that a real customer would ask.
+
+Requirements:
+- Keep it conversational and natural (like real speech)
+- Make it specific to what they just mentioned
+- Keep it under 20 words
+- Ask about clarification, details, pricing, implementation, benefits, or comparisons
+- Sound genuinely curious, not confrontational"""
+
+NATURAL_RESPONSE_SYSTEM_PROMPT = """You are an engaged customer in a sales meeting. Respond naturally to questions and engage in dialogue.
+You will be given the recent conversation and what the salesperson just said.
+
+HOW TO RESPOND:
+
+If they asked a DIRECT QUESTION (ends with ? and clearly directed at you):
+- Answer naturally in 10-25 words
+
+If they made a STATEMENT or are still presenting:
+- STAY SILENT - let them finish their pitch
+- Salespeople need time to explain their product
+- Only respond if ALL of these are true:
+  * They've clearly finished a major point (not just pausing mid-thought)
+  * You have a critical clarification question
+  * It feels natural for a customer to interject
+
+Be a PATIENT listener - real customers don't interrupt every 10 seconds.
+Most pauses are just the salesperson gathering their thoughts."""
+
+# Output instructions for each analysis section. The JSON structure itself is
+# enforced server-side via SECTION_RESPONSE_FORMATS, so no example is sent.
+SECTION_OUTPUT_FORMATS = {
+    "scores": """# Output Format
+
+Score the presentation on every criterion.
+
+- Calculate overall_score as weighted average of criteria scores
+- Set performance_level based on overall_score:
+   - excellent: 9-10
+   - good: 7-8
+   - fair: 5-6
+   - needs_improvement: 1-4
+""",
+    "feedback": """# Output Format
+
+Give coaching feedback on the presentation.
+
+- Provide 3-5 strengths and 3-5 improvement areas
+- Include at least 3 items in strengths, improvements, and next_steps
+- Ensure recommendations are actionable and measurable
+- Use a direct quote from the transcript as example, or null
+""",
+    "rule_violations": """# Output Format
+
+Check compliance with the custom rules.
+
+- rule_category is one of: politeness, company_wording, sales_structure, engagement
+- severity is one of: low, medium, high
+- Use a quote showing the violation as example, or null
+- Rule violations array can be empty if no violations detected
+""",
+}
+
+# Pydantic model (schema source), msgspec decoder and output token budget
+# for each analysis section, in the order expected by to_report
+ANALYSIS_SECTIONS = {
+    "scores": (ScoresSection, SCORES_DECODER, 300),
+    "feedback": (FeedbackSection, FEEDBACK_DECODER, 1500),
+    "rule_violations": (RuleViolationsSection, RULE_VIOLATIONS_DECODER, 800),
+}
+
+
+
+def _strict_json_schema(model_cls) -> Dict[str, Any]:
+    """
+    Build a strict structured-output JSON schema from a Pydantic model.
+    
+    Strict mode requires every property to be listed as required and forbids
+    additional properties, allOf and numeric range keywords; bounds are still
+    enforced when the response is validated with the Pydantic model.
+    """
+    def _make_strict(node):
+        if isinstance(node, dict):
+            # Pydantic wraps described nested models as allOf: [{"$ref": ...}]
+            if len(node.get("allOf", ())) == 1:
+                ref = node.pop("allOf")[0]
+                node.clear()
+                node.update(ref)
+            node.pop("default", None)
+            node.pop("minimum", None)
+            node.pop("maximum", None)
+            if node.get("type") == "object" and "properties" in node:
+                node["required"] = list(node["properties"])
+                node["additionalProperties"] = False
+            for value in node.values():
+                _make_strict(value)
+        elif isinstance(node, list):
+            for item in node:
+                _make_strict(item)
+        return node
+    
+    return _make_strict(model_cls.model_json_schema())
+
+
+# Server-side enforced response format for each analysis section, built once
+SECTION_RESPONSE_FORMATS = {
+    section: {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model_cls.__name__,
+            "schema": _strict_json_schema(model_cls),
+            "strict": True
+        }
+    }
+    for section, (model_cls, _, _) in ANALYSIS_SECTIONS.items()
+}
+
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# Transient Azure OpenAI failures worth retrying before failing the call
+RETRYABLE_LLM_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+LLM_RETRY_ATTEMPTS = 3
+LLM_RETRY_MAX_WAIT = 8
+
+_backoff = wait_random_exponential(multiplier=0.5, max=LLM_RETRY_MAX_WAIT)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Wait as long as the Retry-After header asks, else exponential backoff with jitter."""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    if response is not None:
+        try:
+            return min(float(response.headers.get("retry-after")), LLM_RETRY_MAX_WAIT)
+        except (TypeError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+
+# Long transcripts keep the intro and the closing (CTA) verbatim and
+# summarize the middle so prefill stays within the token budget
+TRANSCRIPT_HEAD_SHARE = 0.2
+TRANSCRIPT_TAIL_SHARE = 0.4
+CHARS_PER_TOKEN = 4
+
+TRANSCRIPT_SUMMARY_SYSTEM_PROMPT = """You condense the middle part of a sales presentation transcript.
+Keep every concrete claim, number, product name, customer question, objection and answer.
+Keep short direct quotes that show wording, filler words or rule-relevant phrasing.
+Return only the condensed text, no headings."""
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the GPT-4o tokenizer once; None if it cannot be loaded (e.g. offline)."""
+    try:
+        return tiktoken.encoding_for_model("gpt-4o")
+    except Exception as e:
+        logger.warning("Tokenizer unavailable, approximating token counts: %s", e)
+        return None
+
+
+def _split_transcript(transcript: str, max_tokens: int) -> Optional[Tuple[str, str, str]]:
+    """
+    Split an over-budget transcript into (head, middle, tail).
+    
+    Returns None when the transcript already fits within max_tokens.
+    """
+    head_tokens = int(max_tokens * TRANSCRIPT_HEAD_SHARE)
+    tail_tokens = int(max_tokens * TRANSCRIPT_TAIL_SHARE)
+    
+    encoding = _get_encoding()
+    if encoding is None:
+        if len(transcript) <= max_tokens * CHARS_PER_TOKEN:
+            return None
+        # Move both cuts back to the nearest space so no word is split
+        head_end = transcript.rfind(" ", 0, head_tokens * CHARS_PER_TOKEN + 1)
+        if head_end <= 0:
+            head_end = head_tokens * CHARS_PER_TOKEN
+        tail_start = len(transcript) - tail_tokens * CHARS_PER_TOKEN
+        space = transcript.find(" ", tail_start - 1)
+        if space != -1:
+            tail_start = space + 1
+        return (
+            transcript[:head_end].rstrip(),
+            transcript[head_end:tail_start].strip(),
+            transcript[tail_start:],
+        )
+    
+    tokens = encoding.encode(transcript)
+    if len(tokens) <= max_tokens:
+        return None
+    return (
+        encoding.decode(tokens[:head_tokens]),
+        encoding.decode(tokens[head_tokens:-tail_tokens]),
+        encoding.decode(tokens[-tail_tokens:]),
+    )
+
+
+# Phrases that mark a question when they open a sentence
+QUESTION_PHRASES = (
+    'what do you think',
+    'any questions',
+    'does that make sense',
+    'do you have any',
+    'tell me what you',
+)
+# A question phrase at the start of the text or right after a period,
+# so detection is one linear scan without splitting into sentences
+_QUESTION_START_RE = re.compile(
+    r'(?:^|\.)\s*(?:' + '|'.join(re.escape(phrase) for phrase in QUESTION_PHRASES) + ')',
+    re.IGNORECASE
+)
+
+# Parses "1) question" / "2. question" lines from marshaled question replies
+_NUMBERED_LINE_RE = re.compile(r'^\s*\d+[.)]\s*(.+)$')
+
+# Gate for generate_customer_question: skip snippets with nothing to ask about
+MIN_QUESTION_SNIPPET_CHARS = 30
+MIN_CONTENT_WORDS = 2
+_FILLER_ONLY_RE = re.compile(
+    r'^\s*(?:(?:um+|uh+|er+|hmm+|like|you know|so|okay|ok|well|right|let me see)[\s,.!?]*)+$',
+    re.IGNORECASE
+)
+_WORD_RE = re.compile(r"[a-z][a-z'-]+", re.IGNORECASE)
+_NON_CONTENT_WORDS = frozenset({
+    'the', 'and', 'but', 'for', 'you', 'your', 'are', 'was', 'were', 'this', 'that',
+    'these', 'those', 'with', 'have', 'has', 'had', 'can', 'will', 'just', 'let',
+    'find', 'one', 'sec', 'second', 'moment', 'here', 'there', 'what', 'where',
+    'when', 'how', 'who', 'our', 'its', 'it\'s', 'i\'m', 'we\'re', 'um', 'uh',
+    'umm', 'uhh', 'like', 'know', 'okay', 'well', 'right', 'see', 'slide', 'next',
+})
+
+
+def _should_generate_question(recent_transcript: str) -> bool:
+    """
+    Cheap local check for whether a snippet is worth a customer question.
+    
+    Rejects short snippets, pure filler ("um, let me see") and snippets without
+    enough content words, so the LLM is only called when there is substance.
+    """
+    if len(recent_transcript.strip()) < MIN_QUESTION_SNIPPET_CHARS:
+        return False
+    
+    if _FILLER_ONLY_RE.match(recent_transcript):
+        return False
+    
+    content_words = sum(
+        1 for word in _WORD_RE.findall(recent_transcript)
+        if word.lower() not in _NON_CONTENT_WORDS
+    )
+    return content_words >= MIN_CONTENT_WORDS
+
+
+def _is_direct_question(presenter_text: str) -> bool:
+    """
+    Check whether the presenter asked the customer a question.
+    
+    Only triggers on a trailing question mark or a known question phrase at the
+    START of a sentence (more likely to be a real question).
+    """
+    if presenter_text.strip().endswith('?'):
+        return True
+    
+    return _QUESTION_START_RE.search(presenter_text) is not None
+
+
+# Gate for live responses: a pause after one of these words (or after a comma)
+# is a breath in the middle of a sentence, not a turn the customer should take.
+# Only words that cannot end a statement belong here (conjunctions, articles,
+# prepositions, fillers); "that's what it is" must still reach the LLM.
+_CONTINUATION_WORDS = frozenset({
+    'and', 'but', 'or', 'because', 'if',
+    'the', 'a', 'an',
+    'to', 'of', 'for', 'with',
+    'um', 'uh', 'umm', 'uhh', 'er',
+})
+_TRAILING_WORD_RE = re.compile(r"([a-z']+)[^a-z']*$", re.IGNORECASE)
+
+
+def _should_consider_response(presenter_text: str) -> bool:
+    """
+    Cheap local check for whether a pause is worth asking the LLM about.
+    
+    Rejects pure filler, snippets without enough content words and pauses that
+    end mid-sentence (trailing comma or continuation word), where the model
+    would almost always stay silent anyway.
+    """
+    text = presenter_text.rstrip()
+    
+    if _FILLER_ONLY_RE.match(text):
+        return False
+    
+    content_words = sum(
+        1 for word in _WORD_RE.findall(text)
+        if word.lower() not in _NON_CONTENT_WORDS
+    )
+    if content_words < MIN_CONTENT_WORDS:
+        return False
+    
+    if text.endswith((',', ';', ':', '-', '...')):
+        return False
+    
+    trailing = _TRAILING_WORD_RE.search(text)
+    return trailing is None or trailing.group(1).lower() not in _CONTINUATION_WORDS
+
+
+# Streamed responses are split into sentences at terminal punctuation
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+SILENT_MARKERS = frozenset({"SILENT", "SILENCE", "NO RESPONSE"})
+
+
+def _clean_sentence(sentence: str) -> str:
+    """Strip whitespace and the quotes the model sometimes wraps replies in."""
+    return sentence.strip().strip('"\'').strip()
+
+
+def _is_silent_marker(sentence: str) -> bool:
+    """Check whether the model answered with a stay-silent marker."""
+    return _clean_sentence(sentence).rstrip('.').upper() in SILENT_MARKERS
+
+
+# Punctuation is dropped before fingerprinting so "...pricing." matches "...pricing"
+_SNIPPET_PUNCTUATION_RE = re.compile(r"[^\w\s']+")
+
+
+class QuestionCache:
+    """
+    LRU cache of generated customer questions keyed by transcript snippet.
+    
+    Snippets are normalized (lowercased, punctuation removed, whitespace
+    collapsed, trimmed to the last max_chars characters at a word boundary)
+    before hashing. Near-duplicates are matched through a
+    64-bit SimHash fingerprint within a small Hamming distance.
+    """
+    
+    def __init__(self, maxsize: int = 512, max_chars: int = 400, max_distance: int = 3):
+        self.maxsize = maxsize
+        self.max_chars = max_chars
+        self.max_distance = max_distance
+        # digest -> (simhash, question), ordered oldest to most recently used
+        self._entries: "OrderedDict[bytes, Tuple[int, str]]" = OrderedDict()
+    
+    def _normalize(self, snippet: str) -> str:
+        text = " ".join(_SNIPPET_PUNCTUATION_RE.sub(" ", snippet.lower()).split())
+        if len(text) <= self.max_chars:
+            return text
+        
+        tail = text[-self.max_chars:]
+        if text[-self.max_chars - 1] != " ":
+            # Drop the word the cut went through
+            tail = tail.partition(" ")[2] or tail
+        return tail
+    
+    @staticmethod
+    def _simhash(text: str) -> int:
+        """Compute a 64-bit SimHash over the words of text."""
+        weights = [0] * 64
+        for word in text.split():
+            h = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "big")
+            for bit in range(64):
+                weights[bit] += 1 if (h >> bit) & 1 else -1
+        return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+    
+    def get(self, snippet: str) -> Optional[str]:
+        """Return a cached question for snippet or a near-duplicate of it."""
+        normalized = self._normalize(snippet)
+        key = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+        
+        entry = self._entries.get(key)
+        if entry is None:
+            fingerprint = self._simhash(normalized)
+            for candidate_key, (candidate_hash, _) in self._entries.items():
+                if (fingerprint ^ candidate_hash).bit_count() <= self.max_distance:
+                    key = candidate_key
+                    entry = self._entries[key]
+                    break
+        
+        if entry is None:
+            return None
+        
+        self._entries.move_to_end(key)
+        return entry[1]
+    
+    def put(self, snippet: str, question: str):
+        """Store question for snippet, evicting the least recently used entry if full."""
+        normalized = self._normalize(snippet)
+        key = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+        
+        self._entries[key] = (self._simhash(normalized), question)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Inputs longer than this are not embedded (the embedding model caps at 8191 tokens)
+EMBEDDING_MAX_CHARS = 24000
+
+
+class SemanticCache:
+    """
+    Cache of LLM results keyed by input embedding.
+    
+    Embeddings are L2-normalized and kept in a fixed-size matrix, so a lookup is a
+    single matrix-vector product; the most similar live entry is a hit when its
+    cosine similarity reaches threshold. Entries expire after ttl seconds and the
+    oldest slot is overwritten when the cache is full.
+    """
+    
+    def __init__(self, threshold: float, ttl: float, maxsize: int = 512):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._vectors: Optional[np.ndarray] = None
+        self._expires_at = np.zeros(maxsize)
+        self._values: List[Any] = [None] * maxsize
+        self._next_slot = 0
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+    
+    def get(self, embedding: List[float]) -> Optional[Any]:
+        """Return the cached value for the most similar live entry, if similar enough."""
+        if self._vectors is None:
+            return None
+        
+        similarities = self._vectors @ self._normalize(embedding)
+        similarities[self._expires_at < time.monotonic()] = -1.0
+        slot = int(np.argmax(similarities))
+        if similarities[slot] < self.threshold:
+            return None
+        return self._values[slot]
+    
+    def put(self, embedding: List[float], value: Any):
+        """Store value for embedding, overwriting the oldest entry if full."""
+        vector = self._normalize(embedding)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+        
+        slot = self._next_slot
+        self._vectors[slot] = vector
+        self._values[slot] = value
+        self._expires_at[slot] = time.monotonic() + self.ttl
+        self._next_slot = (slot + 1) % self.maxsize
+
+
+class ReportCache:
+    """
+    Cache of analysis reports keyed by an exact hash of the transcript.
+    
+    Only an identical transcript (e.g. a retried request) is a hit; a new attempt
+    at the same pitch always gets a fresh report. Entries expire after ttl
+    seconds and the least recently used entry is dropped when the cache is full.
+    """
+    
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+    
+    @staticmethod
+    def _key(transcript: str) -> bytes:
+        return hashlib.blake2b(transcript.encode(), digest_size=16).digest()
+    
+    def get(self, transcript: str) -> Optional[Any]:
+        """Return the cached report for transcript, if present and not expired."""
+        key = self._key(transcript)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, report = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return report
+    
+    def put(self, transcript: str, report: Any):
+        """Store report for transcript, evicting the oldest entry if full."""
+        key = self._key(transcript)
+        self._entries[key] = (time.monotonic() + self.ttl, report)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Interned speaker labels used when formatting conversation context
+SPEAKER_LABELS = {
+    "presenter": "PRESENTER",
+    "customer": "CUSTOMER",
+}
+
+
+class ConversationHistory:
+    """
+    Conversation turns of one interactive session.
+    
+    Each turn is formatted once when appended; the most recent turns are kept in
+    a ring buffer so prompt context is a single join rather than a rebuild.
+    """
+    
+    CONTEXT_TURNS = 4
+    
+    def __init__(self):
+        self._lines: List[str] = []
+        self._context_ring: Deque[str] = deque(maxlen=self.CONTEXT_TURNS)
+    
+    def append(self, speaker: str, text: str):
+        """Record a turn spoken by speaker ("presenter" or "customer")."""
+        line = f"{SPEAKER_LABELS.get(speaker) or speaker.upper()}: {text}"
+        self._lines.append(line)
+        self._context_ring.append(line)
+    
+    @property
+    def context(self) -> str:
+        """Formatted recent turns for the LLM prompt."""
+        return "\n".join(self._context_ring)
+    
+    def recent(self, turns: int) -> str:
+        """Formatted last turns of the conversation."""
+        return "\n".join(list(self._context_ring)[-turns:])
+    
+    def transcript(self) -> str:
+        """Formatted full conversation transcript."""
+        return "\n".join(self._lines)
+    
+    def __len__(self) -> int:
+        return len(self._lines)
+
 
 class SalesCoachAgent:
     """
@@ -19,23 +588,118 @@ class SalesCoachAgent:
     Uses Azure AI Foundry with GPT-4o for comprehensive transcript analysis.
     """
     
-    def __init__(self):
-        """Initialize the sales coach agent with Foundry client."""
-        self.client = config.get_openai_client()
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the sales coach agent with async Foundry client.
+        
+        Args:
+            http_client: Shared HTTP client (connection pool) for Azure OpenAI requests
+        """
+        config = get_config()
+        self.aclient = config.get_async_openai_client(http_client=http_client)
         self.model = config.settings.gpt_model_name
         self.system_prompt = self._build_system_prompt()
+        self.section_prompts = self._build_section_prompts()
+        
+        # Caps in-flight LLM requests to stay within Azure RPM quotas
+        self._llm_semaphore = asyncio.Semaphore(config.settings.max_concurrent_llm)
+        
+        self._question_cache = QuestionCache()
+        
+        # Analysis reports are cached by exact transcript; live responses use a
+        # semantic cache, disabled when no embedding deployment is configured
+        self._report_cache = ReportCache(ttl=config.settings.semantic_cache_ttl_seconds)
+        self.embedding_model = config.settings.embedding_model_name
+        self.embedding_dimensions = config.settings.embedding_dimensions
+        self._response_cache = SemanticCache(
+            threshold=config.settings.semantic_cache_threshold,
+            ttl=config.settings.semantic_cache_ttl_seconds
+        )
+    
+    async def warmup(self):
+        """
+        Load the tokenizer in a worker thread.
+        
+        tiktoken downloads its BPE file on first use; doing that at startup keeps
+        the first analysis from blocking the event loop on network I/O.
+        """
+        await asyncio.to_thread(_get_encoding)
+    
+    async def aclose(self):
+        """Close the underlying async HTTP client."""
+        await self.aclient.close()
+    
+    @retry(
+        stop=stop_after_attempt(LLM_RETRY_ATTEMPTS),
+        wait=_wait_retry_after,
+        retry=retry_if_exception_type(RETRYABLE_LLM_ERRORS),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    async def _create_completion(self, **kwargs):
+        """Create a chat completion, retrying transient Azure errors with backoff."""
+        return await self.aclient.chat.completions.create(**kwargs)
+    
+    async def _chat(self, **kwargs):
+        """Issue a chat completion request, bounded by the concurrency semaphore."""
+        async with self._llm_semaphore:
+            return await self._create_completion(**kwargs)
+    
+    async def _chat_stream(self, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+        
+        The concurrency semaphore is held until the stream is exhausted.
+        """
+        async with self._llm_semaphore:
+            stream = await self._create_completion(stream=True, **kwargs)
+            async for chunk in stream:
+                # Azure sends content-filter chunks without choices
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    
+    async def _chat_text(self, **kwargs) -> str:
+        """Stream a chat completion and return the full response text."""
+        return "".join([delta async for delta in self._chat_stream(**kwargs)])
+    
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed text for semantic cache lookups.
+        
+        Returns None when caching is disabled, the text is too long or the
+        request fails; callers then fall through to the LLM.
+        """
+        if not self.embedding_model or len(text) > EMBEDDING_MAX_CHARS:
+            return None
+        
+        try:
+            async with self._llm_semaphore:
+                response = await self.aclient.embeddings.create(
+                    model=self.embedding_model,
+                    input=text,
+                    dimensions=self.embedding_dimensions
+                )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning("Embedding request failed, skipping semantic cache: %s", e)
+            return None
     
     def _build_system_prompt(self) -> str:
-        """Build comprehensive system prompt with custom rules."""
-        rules_section = config.get_rules_prompt_section()
+        """
+        Build the shared analysis prompt with custom rules.
+        
+        This is the common prefix of every analysis sub-call; the section-specific
+        output format is appended by _build_section_prompts.
+        """
+        rules_section = get_config().get_rules_prompt_section()
         
         prompt = f"""# Role
 You are an expert AI sales coach analyzing sales presentation transcripts to provide 
 specific, actionable coaching feedback.
 
 # Task
-Analyze the provided sales presentation transcript and generate a structured improvement 
-report with detailed scores, strengths, improvement areas, and rule compliance assessment.
+Analyze the provided sales presentation transcript and generate one section of a structured 
+improvement report, as described in the Output Format below.
 
 # Analysis Criteria
 
@@ -75,117 +739,245 @@ Evaluate adherence to the following custom rules:
 
 {rules_section}
 
-# Output Format
-
-You MUST respond with valid JSON matching this exact structure:
-
-{{
-  "overall_score": <number 1-10>,
-  "performance_level": "<excellent|good|fair|needs_improvement>",
-  "criteria_scores": {{
-    "value_proposition": <number 1-10>,
-    "objection_handling": <number 1-10>,
-    "active_listening": <number 1-10>,
-    "question_quality": <number 1-10>,
-    "call_to_action": <number 1-10>,
-    "engagement": <number 1-10>,
-    "rule_compliance": <number 1-10>
-  }},
-  "strengths": [
-    "<specific strength with brief example>"
-  ],
-  "improvements": [
-    {{
-      "area": "<improvement category>",
-      "current_state": "<what was observed>",
-      "recommendation": "<specific action to take>",
-      "example": "<direct quote from transcript or null>"
-    }}
-  ],
-  "rule_violations": [
-    {{
-      "rule_category": "<politeness|company_wording|sales_structure|engagement>",
-      "rule_name": "<specific rule>",
-      "severity": "<low|medium|high>",
-      "description": "<what was violated>",
-      "example": "<quote showing violation or null>",
-      "suggestion": "<how to fix>"
-    }}
-  ],
-  "summary": "<2-3 sentence overall assessment>",
-  "next_steps": [
-    "<actionable recommendation>"
-  ]
-}}
-
 # Guidelines
 
 1. Base ALL feedback on evidence from the transcript
 2. Be specific and constructive - avoid generic advice
 3. Include direct quotes as examples wherever possible
-4. Provide 3-5 strengths and 3-5 improvement areas
-5. Focus on behaviors and techniques, not personality
-6. Ensure recommendations are actionable and measurable
-7. Calculate overall_score as weighted average of criteria scores
-8. Set performance_level based on overall_score:
-   - excellent: 9-10
-   - good: 7-8
-   - fair: 5-6
-   - needs_improvement: 1-4
+4. Focus on behaviors and techniques, not personality
 
 # Important
 - Return ONLY valid JSON, no additional text or markdown
 - Ensure all JSON strings are properly escaped
-- Include at least 3 items in strengths, improvements, and next_steps
-- Rule violations array can be empty if no violations detected
 """
         return prompt
     
-    async def analyze_presentation(self, transcript: str) -> SalesCoachingReport:
+    def _build_section_prompts(self) -> Dict[str, str]:
+        """Build one system prompt per analysis section, sharing the common prefix."""
+        return {
+            section: f"{self.system_prompt}\n{output_format}"
+            for section, output_format in SECTION_OUTPUT_FORMATS.items()
+        }
+    
+    def _section_request(self, section: str, transcript: str) -> Dict[str, Any]:
+        """Build the chat completion request body for one analysis section."""
+        _, _, max_tokens = ANALYSIS_SECTIONS[section]
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.section_prompts[section]},
+                {"role": "user", "content": f"Analyze this sales presentation transcript:\n\n{transcript}"}
+            ],
+            "response_format": SECTION_RESPONSE_FORMATS[section],
+            "temperature": 0.7,
+            "max_tokens": max_tokens
+        }
+    
+    async def _analyze_section(self, section: str, transcript: str):
         """
-        Analyze a sales presentation transcript and generate coaching report.
+        Run one analysis sub-call and validate its JSON fragment.
         
         Args:
+            section: Key into ANALYSIS_SECTIONS
             transcript: Complete presentation transcript text
             
         Returns:
-            SalesCoachingReport: Structured coaching report with scores and recommendations
+            Validated msgspec struct for the section
+        """
+        _, decoder, _ = ANALYSIS_SECTIONS[section]
+        response = await self._chat(**self._section_request(section, transcript))
+        
+        result_json = response.choices[0].message.content
+        logger.debug("Received %s response: %.200s...", section, result_json)
+        
+        # Parse and validate in a single msgspec pass
+        return decoder.decode(result_json)
+    
+    async def _score_criteria(self, transcript: str) -> ScoresSectionStruct:
+        """Score each criterion and derive the overall score and performance level."""
+        return await self._analyze_section("scores", transcript)
+    
+    async def _extract_feedback(self, transcript: str) -> FeedbackSectionStruct:
+        """Extract strengths, improvement areas, summary and next steps."""
+        return await self._analyze_section("feedback", transcript)
+    
+    async def _detect_rule_violations(self, transcript: str) -> RuleViolationsSectionStruct:
+        """Detect violations of the custom coaching rules."""
+        return await self._analyze_section("rule_violations", transcript)
+    
+    async def _prepare_transcript(self, transcript: str) -> str:
         """
-        logger.info(f"Analyzing presentation transcript ({len(transcript)} characters)")
+        Fit a transcript into the analysis token budget.
+        
+        Transcripts within budget are returned unchanged. Longer ones keep the
+        first 20% (intro) and last 40% (closing) of the budget verbatim and have
+        the middle condensed by a cheaper model.
+        
+        Args:
+            transcript: Complete presentation transcript text
+            
+        Returns:
+            str: Transcript to send for analysis
+        """
+        config = get_config()
+        max_tokens = config.settings.max_transcript_tokens
+        
+        # Tokenizing a long transcript is CPU-bound; keep it off the event loop
+        parts = await asyncio.to_thread(_split_transcript, transcript, max_tokens)
+        if parts is None:
+            return transcript
+        
+        head, middle, tail = parts
+        logger.info("Transcript over %s tokens, condensing middle (%s characters)", max_tokens, len(middle))
         
         try:
-            # Call GPT-4o for analysis
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = await self._chat(
+                model=config.settings.gpt_summary_model_name or self.model,
                 messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": f"Analyze this sales presentation transcript:\n\n{transcript}"}
+                    {"role": "system", "content": TRANSCRIPT_SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": middle}
                 ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-                max_tokens=2000
+                temperature=0.3,
+                max_tokens=int(max_tokens * (1 - TRANSCRIPT_HEAD_SHARE - TRANSCRIPT_TAIL_SHARE))
             )
+            condensed = response.choices[0].message.content.strip()
+        except Exception as e:
+            logger.warning("Failed to condense transcript, omitting middle: %s", e)
+            condensed = "(omitted)"
+        
+        return f"{head}\n\n[... condensed middle of the presentation: {condensed} ...]\n\n{tail}"
+    
+    async def analyze_presentation(self, transcript: str) -> SalesCoachingReport:
+        """
+        Analyze a sales presentation transcript and generate coaching report.
+        
+        The report is split into independent sections (scores, feedback, rule
+        violations) that are requested concurrently and merged client-side, so
+        wall time is bounded by the slowest section rather than their sum.
+        
+        Args:
+            transcript: Complete presentation transcript text
             
-            # Parse JSON response
-            result_json = response.choices[0].message.content
-            logger.debug(f"Received analysis response: {result_json[:200]}...")
+        Returns:
+            SalesCoachingReport: Structured coaching report with scores and recommendations
+        """
+        logger.info("Analyzing presentation transcript (%s characters)", len(transcript))
+        
+        cached = self._report_cache.get(transcript)
+        if cached is not None:
+            logger.info("Using cached analysis report")
+            return cached
+        
+        try:
+            report_key = transcript
+            transcript = await self._prepare_transcript(transcript)
             
-            result_data = json.loads(result_json)
+            scores, feedback, violations = await asyncio.gather(
+                self._score_criteria(transcript),
+                self._extract_feedback(transcript),
+                self._detect_rule_violations(transcript),
+            )
+            report = to_report(scores, feedback, violations)
             
-            # Validate and parse into Pydantic model
-            report = SalesCoachingReport(**result_data)
+            self._report_cache.put(report_key, report)
             
-            logger.info(f"Analysis complete. Overall score: {report.overall_score}/10")
+            logger.info("Analysis complete. Overall score: %s/10", report.overall_score)
             return report
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
+        except msgspec.DecodeError as e:
+            logger.error("Failed to parse JSON response: %s", e)
+            raise ValueError(f"Invalid JSON response from AI model: {e}")
+        except Exception as e:
+            logger.error("Error during presentation analysis: %s", e)
+            raise
+    
+    async def analyze_presentations_batch(self, transcripts: List[str]) -> List[SalesCoachingReport]:
+        """
+        Analyze many transcripts through the Azure OpenAI Batch API.
+        
+        Intended for non-interactive bulk scoring (e.g. overnight runs over recorded
+        presentations): batch jobs are billed at a discount but may take up to 24h.
+        Interactive paths should keep using analyze_presentation.
+        
+        Args:
+            transcripts: Presentation transcripts to analyze
+            
+        Returns:
+            list: One SalesCoachingReport per transcript, in input order
+        """
+        logger.info("Submitting batch analysis for %s transcripts", len(transcripts))
+        
+        config = get_config()
+        batch_model = config.settings.gpt_batch_model_name or self.model
+        
+        # One request per (transcript, section); custom_id encodes both
+        lines = []
+        prepared = await asyncio.gather(*(self._prepare_transcript(t) for t in transcripts))
+        for index, transcript in enumerate(prepared):
+            for section in ANALYSIS_SECTIONS:
+                body = self._section_request(section, transcript)
+                body["model"] = batch_model
+                lines.append(orjson.dumps({
+                    "custom_id": f"{index}:{section}",
+                    "method": "POST",
+                    "url": "/chat/completions",
+                    "body": body
+                }))
+        
+        try:
+            batch_file = await self.aclient.files.create(
+                file=("analysis_batch.jsonl", b"\n".join(lines)),
+                purpose="batch"
+            )
+            batch = await self.aclient.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/chat/completions",
+                completion_window="24h"
+            )
+            logger.info("Created batch job %s", batch.id)
+            
+            while batch.status not in BATCH_TERMINAL_STATUSES:
+                await asyncio.sleep(config.settings.batch_poll_interval_seconds)
+                batch = await self.aclient.batches.retrieve(batch.id)
+                logger.debug("Batch %s status: %s", batch.id, batch.status)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Batch job {batch.id} ended with status '{batch.status}'")
+            
+            output = await self.aclient.files.content(batch.output_file_id)
+            
+            sections: Dict[Tuple[int, str], Any] = {}
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                result = orjson.loads(line)
+                index, section = result["custom_id"].split(":", 1)
+                if result.get("error") or result["response"]["status_code"] != 200:
+                    raise RuntimeError(f"Batch request {result['custom_id']} failed: {result.get('error')}")
+                
+                _, decoder, _ = ANALYSIS_SECTIONS[section]
+                content = result["response"]["body"]["choices"][0]["message"]["content"]
+                sections[(int(index), section)] = decoder.decode(content)
+            
+            reports = [
+                to_report(*(sections[(index, section)] for section in ANALYSIS_SECTIONS))
+                for index in range(len(transcripts))
+            ]
+            
+            logger.info("Batch analysis complete: %s reports", len(reports))
+            return reports
+            
+        except msgspec.DecodeError as e:
+            logger.error("Failed to parse JSON response: %s", e)
             raise ValueError(f"Invalid JSON response from AI model: {e}")
+        except KeyError as e:
+            logger.error("Batch output is missing result %s", e)
+            raise RuntimeError(f"Incomplete batch output: missing {e}")
         except Exception as e:
-            logger.error(f"Error during presentation analysis: {e}")
+            logger.error("Error during batch analysis: %s", e)
             raise
     
-    def generate_coaching_script(self, report: SalesCoachingReport) -> str:
+    async def generate_coaching_script(self, report: SalesCoachingReport) -> str:
         """
         Generate a conversational coaching script for avatar delivery.
         
@@ -198,28 +990,14 @@ You MUST respond with valid JSON matching this exact structure:
         logger.info("Generating coaching script for avatar delivery")
         
         try:
-            # Create prompt for script generation
-            script_prompt = f"""
-Convert this sales coaching report into a natural, conversational script that an AI avatar 
-will speak to the presenter. The script should be encouraging, specific, and actionable.
-
-Coaching Report (JSON):
-{report.model_dump_json(indent=2)}
-
-Create a 60-90 second script with this structure:
-1. Warm opening with overall score
-2. Highlight 2-3 key strengths
-3. Discuss 2-3 main improvement areas with specific examples
-4. End with encouragement and 1-2 actionable next steps
-
-Make it conversational, supportive, and professional. Use "you" to address the presenter.
-Return ONLY the script text, no additional formatting or labels.
-"""
+            # Only the report varies per call; instructions live in the cached system prefix
+            script_prompt = f"""Coaching Report (JSON):
+{report.model_dump_json()}"""
             
-            response = self.client.chat.completions.create(
+            response = await self._chat(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a supportive sales coach providing feedback."},
+                    {"role": "system", "content": COACHING_SCRIPT_SYSTEM_PROMPT},
                     {"role": "user", "content": script_prompt}
                 ],
                 temperature=0.8,
@@ -227,163 +1005,235 @@ Return ONLY the script text, no additional formatting or labels.
             )
             
             script = response.choices[0].message.content.strip()
-            logger.info(f"Generated coaching script ({len(script)} characters)")
+            logger.info("Generated coaching script (%s characters)", len(script))
             
             return script
             
         except Exception as e:
-            logger.error(f"Error generating coaching script: {e}")
+            logger.error("Error generating coaching script: %s", e)
             raise
     
-    async def generate_customer_question(self, recent_transcript: str) -> str:
+    async def generate_customer_question(self, recent_transcript: str, use_cache: bool = True) -> str:
         """
         Generate a realistic customer question based on what the presenter just said.
         
+        Questions are cached by normalized snippet, so repeated or near-identical
+        snippets are answered without an LLM round-trip.
+        
         Args:
             recent_transcript: Recent portion of the presentation transcript
+            use_cache: Set to False to always generate a fresh question
             
         Returns:
-            str: A natural customer question
+            str: A natural customer question (empty string if nothing worth asking about)
         """
+        if not _should_generate_question(recent_transcript):
+            logger.info("Nothing question-worthy in snippet, skipping question")
+            return ""
+        
+        if use_cache:
+            cached = self._question_cache.get(recent_transcript)
+            if cached is not None:
+                logger.info("Using cached customer question: %s", cached)
+                return cached
+        
         logger.info("Generating customer question")
         
         try:
-            prompt = f"""You are a potential customer listening to a sales presentation. 
-Based on what the salesperson just said, ask ONE brief, natural follow-up question that a real customer would ask.
-
-Requirements:
-- Keep it conversational and natural (like real speech)
-- Make it specific to what they just mentioned
-- Keep it under 20 words
-- Ask about clarification, details, pricing, implementation, benefits, or comparisons
-- Sound genuinely curious, not confrontational
-
-What the salesperson said:
+            prompt = f"""What the salesperson said:
 "{recent_transcript}"
 
 Generate ONE customer question (return only the question text, no labels):"""
             
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            response_text = await self._chat_text(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a curious potential customer asking natural follow-up questions."},
+                    {"role": "system", "content": CUSTOMER_QUESTION_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.9,
                 max_tokens=50
             )
             
-            question = response.choices[0].message.content.strip()
+            question = response_text.strip()
             # Remove quotes if present
             question = question.strip('"\'')
             
-            logger.info(f"Generated customer question: {question}")
+            # An empty reply would otherwise be served for every similar snippet
+            if use_cache and question:
+                self._question_cache.put(recent_transcript, question)
+            
+            logger.info("Generated customer question: %s", question)
             return question
             
         except Exception as e:
-            logger.error(f"Error generating customer question: {e}")
+            logger.error("Error generating customer question: %s", e)
             # Return a generic question as fallback
             return "Could you tell me more about that?"
     
-    async def generate_natural_response(self, presenter_text: str, conversation_history: list) -> str:
+    async def generate_customer_questions_marshaled(self, segments: List[str], k: int = 4) -> List[str]:
         """
-        Generate a natural customer response - or stay silent.
-        Always responds to questions, engages naturally in conversation.
+        Generate customer questions for several presenter segments in one LLM call.
+        
+        Packs the last k unhandled segments into a single numbered prompt so that
+        questions can be precomputed during silence. The agent is shared by all
+        sessions, so the caller keeps the returned questions with its own session.
         
         Args:
-            presenter_text: What the presenter just said
-            conversation_history: Previous conversation exchanges
+            segments: Presenter segments that have not been asked about yet
+            k: Maximum number of segments to marshal into one request
             
         Returns:
-            str: Avatar's response (empty string means stay silent)
+            list: Generated questions, in segment order (may be shorter than k)
         """
-        logger.info(f"Considering response to: {presenter_text[:80]}...")
+        batch = [segment for segment in segments if _should_generate_question(segment)][-k:]
+        if not batch:
+            return []
+        
+        logger.info("Generating %s customer questions in one request", len(batch))
         
         try:
-            # Build recent conversation context
-            context = "\n".join([
-                f"{h['speaker'].upper()}: {h['text']}" 
-                for h in conversation_history[-4:]
-            ])
-            
-            # Check if it's clearly a question DIRECTED AT THE CUSTOMER
-            # Only trigger on question marks or very specific question patterns
-            is_question = (
-                presenter_text.strip().endswith('?') or
-                presenter_text.strip().endswith('??')
+            snippets = "\n".join(
+                f'{number}) "{segment}"' for number, segment in enumerate(batch, start=1)
             )
+            prompt = f"""The salesperson said each of these snippets:
+{snippets}
+
+Generate {len(batch)} distinct customer questions, one per snippet, one per line, numbered to match 
+(return only the numbered question text, no labels):"""
             
-            # Only check for question phrases at the START of sentences (more likely to be questions)
-            sentence_starts = [s.strip().lower()[:20] for s in presenter_text.split('.') if s.strip()]
-            is_question = is_question or any(
-                start.startswith(q) for start in sentence_starts
-                for q in ['what do you think', 'any questions', 'does that make sense', 
-                         'do you have any', 'tell me what you']
+            response_text = await self._chat_text(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": CUSTOMER_QUESTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.9,
+                max_tokens=50 * len(batch)
             )
             
-            prompt = f"""You are a customer in a sales meeting. The salesperson just spoke.
-
-Recent conversation:
+            questions = []
+            for line in response_text.splitlines():
+                match = _NUMBERED_LINE_RE.match(line)
+                if match:
+                    questions.append(match.group(1).strip().strip('"\''))
+            
+            logger.info("Generated %s customer questions", len(questions))
+            return questions
+            
+        except Exception as e:
+            logger.error("Error generating customer questions: %s", e)
+            return []
+    
+    async def stream_natural_response(
+        self, presenter_text: str, conversation_history: ConversationHistory
+    ) -> AsyncIterator[str]:
+        """
+        Stream a natural customer response sentence by sentence - or stay silent.
+        Always responds to questions, engages naturally in conversation.
+        
+        Each sentence is yielded as soon as the model finishes it, so the avatar
+        can start speaking while the rest is still being generated.
+        
+        Args:
+            presenter_text: What the presenter just said
+            conversation_history: Previous conversation exchanges
+            
+        Yields:
+            str: Sentences of the avatar's response (nothing means stay silent)
+        """
+        logger.info("Considering response to: %.80s...", presenter_text)
+        
+        # Check if it's clearly a question DIRECTED AT THE CUSTOMER
+        is_question = _is_direct_question(presenter_text)
+        
+        # Questions always get an answer; otherwise skip the LLM for mid-thought pauses
+        if not is_question and not _should_consider_response(presenter_text):
+            logger.info("✓ Staying silent (mid-thought, decided locally)")
+            return
+        
+        try:
+            # Key the cache on the utterance plus the last two turns so the same
+            # words in a different conversational context are not a hit
+            embedding = await self._embed(f"{conversation_history.recent(2)}\n{presenter_text}")
+            if embedding is not None:
+                cached = self._response_cache.get(embedding)
+                if cached is not None:
+                    logger.info("✓ Using cached response: %s", cached)
+                    yield cached
+                    return
+            
+            # Recent conversation context is preformatted by ConversationHistory
+            context = conversation_history.context
+            
+            prompt = f"""Recent conversation:
 {context if context else "(Just started)"}
 
 Salesperson: "{presenter_text}"
 
-HOW TO RESPOND:
-
-If they asked a DIRECT QUESTION (ends with ? and clearly directed at you):
-- Answer naturally in 10-25 words
-
-If they made a STATEMENT or are still presenting:
-- STAY SILENT - let them finish their pitch
-- Salespeople need time to explain their product
-- Only respond if ALL of these are true:
-  * They've clearly finished a major point (not just pausing mid-thought)
-  * You have a critical clarification question
-  * It feels natural for a customer to interject
-
-Be a PATIENT listener - real customers don't interrupt every 10 seconds.
-Most pauses are just the salesperson gathering their thoughts.
-
 Response (or "SILENT" to stay quiet):"""
             
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            sentences: List[str] = []
+            silent = False
+            buffer = ""
+            
+            async for delta in self._chat_stream(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are an engaged customer in a sales conversation. Respond naturally to questions and engage in dialogue."},
+                    {"role": "system", "content": NATURAL_RESPONSE_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.8,
                 max_tokens=60
-            )
+            ):
+                buffer += delta
+                *complete, buffer = _SENTENCE_BOUNDARY_RE.split(buffer)
+                for sentence in complete:
+                    # The model signals silence with a marker as its first sentence
+                    silent = silent or (not sentences and _is_silent_marker(sentence))
+                    sentence = _clean_sentence(sentence)
+                    if not silent and len(sentence) >= 2:
+                        sentences.append(sentence)
+                        yield sentence
             
-            avatar_response = response.choices[0].message.content.strip()
-            avatar_response = avatar_response.strip('"\'')
+            silent = silent or (not sentences and _is_silent_marker(buffer))
+            sentence = _clean_sentence(buffer)
+            if not silent and len(sentence) >= 2:
+                sentences.append(sentence)
+                yield sentence
             
             # If it's clearly a question, never stay silent
-            if is_question:
-                if not avatar_response or avatar_response.upper() in ['SILENT', 'SILENCE']:
-                    # Generate a fallback response
-                    avatar_response = "That's a good question. Could you elaborate a bit more?"
-                    logger.info(f"✓ Question detected, forcing response: {avatar_response}")
-                else:
-                    logger.info(f"✓ Question detected, responding: {avatar_response}")
-                return avatar_response
-            
-            # Check if AI chose to stay silent
-            if avatar_response.upper() in ['SILENT', 'SILENCE', 'NO RESPONSE']:
-                logger.info("✓ Staying silent (mid-thought)")
-                return ""
+            if is_question and not sentences:
+                # Generate a fallback response
+                fallback = "That's a good question. Could you elaborate a bit more?"
+                logger.info("✓ Question detected, forcing response: %s", fallback)
+                yield fallback
+                return
             
-            # If response is too generic/empty, stay silent
-            if not avatar_response or len(avatar_response.strip()) < 2:
-                logger.info("✓ Empty response, staying silent")
-                return ""
+            if not sentences:
+                logger.info("✓ Staying silent (mid-thought)")
+                return
             
-            logger.info(f"✓ Responding: {avatar_response}")
-            return avatar_response
+            avatar_response = " ".join(sentences)
+            logger.info("✓ Responding: %s", avatar_response)
+            if embedding is not None:
+                self._response_cache.put(embedding, avatar_response)
             
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
-            return ""
+            logger.error("Error generating response: %s", e)
+    
+    async def generate_natural_response(self, presenter_text: str, conversation_history: ConversationHistory) -> str:
+        """
+        Generate a natural customer response - or stay silent.
+        
+        Args:
+            presenter_text: What the presenter just said
+            conversation_history: Previous conversation exchanges
+            
+        Returns:
+            str: Avatar's response (empty string means stay silent)
+        """
+        sentences = [
+            sentence async for sentence in self.stream_natural_response(presenter_text, conversation_history)
+        ]
+        return " ".join(sentences)
@@ -2,12 +2,22 @@
 Configuration management for the sales coach application.
 """
 import os
-import json
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
+from urllib.parse import urlparse
+import orjson
 from pydantic_settings import BaseSettings
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
+
+# Azure and OpenAI SDKs are imported lazily on first use to keep import cheap
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncAzureOpenAI
+    from azure.identity import DefaultAzureCredential
+    from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+    from azure.ai.projects import AIProjectClient
+
+RULES_PATH = Path(__file__).parent.parent / "config" / "rules.json"
 
 
 class Settings(BaseSettings):
@@ -24,10 +34,40 @@ class Settings(BaseSettings):
     # Model Configuration
     gpt_model_name: str = "gpt-4o"
     gpt_api_version: str = "2024-10-21"
+    max_concurrent_llm: int = 10
+    
+    # Transcripts above this many tokens have their middle condensed
+    max_transcript_tokens: int = 6000
+    gpt_summary_model_name: str = "gpt-4o-mini"
+    
+    # Semantic cache for live replies; set embedding_model_name to an embedding
+    # deployment (e.g. text-embedding-3-small) to enable it
+    embedding_model_name: str = ""
+    embedding_dimensions: int = 256
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_ttl_seconds: int = 86400
+    
+    # Batch analysis (Azure OpenAI Batch API); defaults to gpt_model_name
+    gpt_batch_model_name: str = ""
+    batch_poll_interval_seconds: int = 60
+    
+    # Speech synthesis
+    tts_pool_size: int = 4
+    tts_idle_timeout_seconds: int = 300
+    tts_cache_dir: str = "cache/tts"
+    tts_cache_max_files: int = 256
+    max_concurrent_syntheses: int = 4
+    
+    # Session store; empty keeps sessions in process memory (single worker only)
+    redis_url: str = ""
+    redis_pool_size: int = 20
+    session_ttl_seconds: int = 3600
     
     # Application Settings
     environment: str = "development"
     log_level: str = "INFO"
+    web_workers: int = 0  # 0 = one per CPU core (ignored in development)
+    allowed_origins: str = "http://localhost:8000"  # Comma-separated CORS origins
     
     # Optional: Application Insights
     applicationinsights_connection_string: str = ""
@@ -43,34 +83,43 @@ class AppConfig:
     def __init__(self):
         self.settings = Settings()
         self._rules: Dict[str, Any] = {}
-        self._project_client: AIProjectClient | None = None
-        self._credential = DefaultAzureCredential()
+        self._project_client: "AIProjectClient | None" = None
         
         # Load custom rules
         self._load_rules()
     
     def _load_rules(self):
         """Load custom coaching rules from JSON configuration file."""
-        rules_path = Path(__file__).parent.parent / "config" / "rules.json"
+        if not RULES_PATH.exists():
+            raise FileNotFoundError(f"Rules configuration not found at {RULES_PATH}")
         
-        if not rules_path.exists():
-            raise FileNotFoundError(f"Rules configuration not found at {rules_path}")
-        
-        with open(rules_path, 'r') as f:
-            self._rules = json.load(f)
+        self._rules = orjson.loads(RULES_PATH.read_bytes())
     
     @property
     def rules(self) -> Dict[str, Any]:
         """Get custom coaching rules."""
         return self._rules
     
+    @cached_property
+    def credential(self) -> "DefaultAzureCredential":
+        """Azure credential, created on first use."""
+        from azure.identity import DefaultAzureCredential
+        return DefaultAzureCredential()
+    
+    @cached_property
+    def async_credential(self) -> "AsyncDefaultAzureCredential":
+        """Async Azure credential, created on first use."""
+        from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+        return AsyncDefaultAzureCredential()
+    
     @property
-    def project_client(self) -> AIProjectClient:
+    def project_client(self) -> "AIProjectClient":
         """Get or create Azure AI Foundry project client."""
         if self._project_client is None:
+            from azure.ai.projects import AIProjectClient
             self._project_client = AIProjectClient(
                 endpoint=self.settings.foundry_endpoint,
-                credential=self._credential
+                credential=self.credential
             )
         return self._project_client
     
@@ -80,8 +129,43 @@ class AppConfig:
             api_version=self.settings.gpt_api_version
         )
     
+    def get_async_openai_client(self, http_client: "httpx.AsyncClient | None" = None) -> "AsyncAzureOpenAI":
+        """
+        Get async OpenAI client configured for Azure AI Foundry.
+        
+        Mirrors the endpoint/token scope used by AIProjectClient.get_openai_client,
+        but authenticates with the async credential so token refreshes never
+        block the event loop.
+        
+        Args:
+            http_client: Shared HTTP client to send requests through; the SDK
+                creates its own when omitted
+        """
+        from openai import AsyncAzureOpenAI
+        from azure.identity.aio import get_bearer_token_provider
+        
+        parsed = urlparse(self.settings.foundry_endpoint)
+        token_provider = get_bearer_token_provider(
+            self.async_credential,
+            "https://cognitiveservices.azure.com/.default"
+        )
+        
+        # Retries are handled by the agent (tenacity) so they are not doubled here
+        return AsyncAzureOpenAI(
+            azure_endpoint=f"https://{parsed.netloc}",
+            azure_ad_token_provider=token_provider,
+            api_version=self.settings.gpt_api_version,
+            max_retries=0,
+            http_client=http_client
+        )
+    
     def get_rules_prompt_section(self) -> str:
-        """Generate prompt section containing custom rules for agent instructions."""
+        """Get prompt section containing custom rules for agent instructions."""
+        return self.rules_prompt_section
+    
+    @cached_property
+    def rules_prompt_section(self) -> str:
+        """Generate prompt section containing custom rules (built once and memoized)."""
         rules_data = self._rules.get("rules", {})
         
         prompt_sections = []
@@ -143,5 +227,7 @@ Required elements in order:
         return "\n".join(prompt_sections)
 
 
-# Global configuration instance
-config = AppConfig()
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """Get the global configuration instance, created on first call."""
+    return AppConfig()
@@ -3,21 +3,32 @@ FastAPI backend server for AI Sales Coach application.
 """
 import logging
 import asyncio
-import uuid
-from datetime import datetime
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+import os
+import time
+import hashlib
+import httpx
+import orjson
+from datetime import datetime, timezone
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
-from typing import Dict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any
+from pydantic import TypeAdapter
 
-from src.config import config
-from src.agents.sales_coach_agent import SalesCoachAgent
+from src.config import get_config
+from src.agents.sales_coach_agent import SalesCoachAgent, ConversationHistory
 from src.services.speech_service import SpeechService
 from src.services.avatar_service import AvatarService
+from src.services.session_store import SessionStore
 from src.models.report import PresentationSession, SalesCoachingReport
 
+config = get_config()
+
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, config.settings.log_level),
@@ -25,12 +36,116 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-request access logs are noise outside development
+if config.settings.environment != "development":
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+# Connection limits for the shared outbound HTTP client
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Serializes response payloads (including nested Pydantic models) to JSON in
+# one pass through pydantic-core
+PAYLOAD_ADAPTER = TypeAdapter(Dict[str, Any])
+
+# IMPORTANT: Avatar feature is only available in specific regions
+# If your Speech Service is in swedencentral, you need to create a new one
+# in a supported region for avatar to work
+SUPPORTED_AVATAR_REGIONS = frozenset({"westus2", "westeurope", "southeastasia", "eastus", "westus"})
+
+_AVATAR_CONFIG_BASE = {
+    "avatar_character": "Lisa",  # Try with capital L - some SDK versions are case-sensitive
+    "avatar_style": "casual-sitting",
+    "voice_name": "en-US-JennyNeural",
+    "video_format": "webm",
+    "video_codec": "vp9"
+}
+
+UTC = timezone.utc
+
 # Global services
 sales_coach: SalesCoachAgent = None
 avatar_service: AvatarService = None
+session_store: SessionStore = None
+
+
+def json_response(payload: Dict[str, Any]) -> Response:
+    """Build a JSON response without a separate model_dump/encoder pass."""
+    return Response(content=PAYLOAD_ADAPTER.dump_json(payload), media_type="application/json")
+
+
+async def send_ws_json(websocket: WebSocket, payload: Dict[str, Any]):
+    """Send a JSON text frame encoded with orjson."""
+    await websocket.send_text(orjson.dumps(payload).decode())
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that lets browsers reuse assets for a short while.
+    
+    Within max-age the browser does not ask at all; afterwards the existing
+    ETag/Last-Modified revalidation turns repeat fetches into 304s.
+    """
+    
+    CACHE_CONTROL = "public, max-age=300"
+    
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.CACHE_CONTROL
+        return response
+
+
+class IDPool:
+    """
+    Hands out random 128-bit hex IDs from a pre-read block of os.urandom bytes,
+    so one syscall serves many session IDs.
+    
+    The pool fills lazily, so forked workers never share a block.
+    """
+    
+    ID_BYTES = 16
+    BLOCK_IDS = 1024
+    
+    def __init__(self):
+        self._buffer = b""
+        self._offset = 0
+    
+    def next(self) -> str:
+        """Return a new random ID (32 hex characters)."""
+        if self._offset >= len(self._buffer):
+            self._buffer = os.urandom(self.ID_BYTES * self.BLOCK_IDS)
+            self._offset = 0
+        start = self._offset
+        self._offset += self.ID_BYTES
+        return self._buffer[start:self._offset].hex()
+
 
-# Active sessions
-active_sessions: Dict[str, PresentationSession] = {}
+id_pool = IDPool()
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(UTC).isoformat()
+
+
+@lru_cache(maxsize=1)
+def _avatar_config(avatar_region: str, subscription_key: str) -> bytes:
+    """
+    Build the serialized avatar configuration once per region/key pair.
+    
+    The cache is keyed on the subscription key, so a rotated key produces a
+    fresh entry instead of a stale one.
+    """
+    if avatar_region not in SUPPORTED_AVATAR_REGIONS:
+        logger.warning("Region '%s' may not support Avatar feature. Supported regions: %s", avatar_region, sorted(SUPPORTED_AVATAR_REGIONS))
+        # You could override to a supported region if you have a Speech Service there
+    
+    return orjson.dumps({
+        **_AVATAR_CONFIG_BASE,
+        "subscription_key": subscription_key,
+        "region": avatar_region,
+        "supported_regions": sorted(SUPPORTED_AVATAR_REGIONS),
+        "current_region_supported": avatar_region in SUPPORTED_AVATAR_REGIONS
+    })
 
 
 @asynccontextmanager
@@ -38,20 +153,36 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown."""
     # Startup
     logger.info("Starting AI Sales Coach application")
-    global sales_coach, avatar_service
+    global sales_coach, avatar_service, session_store
+    
+    # index.html is immutable per deployment; serve it from memory
+    app.state.index_bytes = Path("static/index.html").read_bytes()
+    app.state.index_etag = f'"{hashlib.blake2b(app.state.index_bytes, digest_size=16).hexdigest()}"'
+    
+    # One connection pool (HTTP/2, keep-alive) shared by all outbound API calls
+    app.state.http = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS)
     
     try:
-        sales_coach = SalesCoachAgent()
-        avatar_service = AvatarService()
+        sales_coach = SalesCoachAgent(http_client=app.state.http)
+        avatar_service = AvatarService(http_client=app.state.http)
+        session_store = SessionStore()
+        await sales_coach.warmup()
         logger.info("Services initialized successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize services: {e}")
+        logger.error("Failed to initialize services: %s", e)
         raise
     
     yield
     
     # Shutdown
     logger.info("Shutting down AI Sales Coach application")
+    if sales_coach is not None:
+        await sales_coach.aclose()
+    if avatar_service is not None:
+        await avatar_service.aclose()
+    if session_store is not None:
+        await session_store.aclose()
+    await app.state.http.aclose()
 
 
 # Create FastAPI app
@@ -59,34 +190,42 @@ app = FastAPI(
     title="AI Sales Coach",
     description="Real-time sales presentation analysis with AI-powered coaching",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=[origin.strip() for origin in config.settings.allowed_origins.split(",") if origin.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# Compress JSON responses (coaching reports are several KB)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the main application page."""
-    return FileResponse("static/index.html")
+    headers = {"ETag": request.app.state.index_etag, "Cache-Control": "public, max-age=60"}
+    if request.headers.get("if-none-match") == request.app.state.index_etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=request.app.state.index_bytes, media_type="text/html", headers=headers)
 
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
+@lru_cache(maxsize=1)
+def _health_payload(second: int) -> Dict[str, Any]:
+    """Health response for one wall-clock second; collapses probe bursts."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "services": {
             "sales_coach": sales_coach is not None,
             "avatar_service": avatar_service is not None
@@ -94,8 +233,14 @@ async def health_check():
     }
 
 
+@app.get("/health")
+async def health_check():
+    """Health check endpoint."""
+    return _health_payload(int(time.time()))
+
+
 @app.get("/api/config")
-async def get_config():
+async def get_client_config():
     """Get client configuration."""
     return {
         "speech_region": config.settings.speech_region,
@@ -113,36 +258,12 @@ async def get_avatar_config():
         dict: Avatar configuration including credentials and settings
     """
     logger.info("Avatar config requested")
-    
-    # IMPORTANT: Avatar feature is only available in specific regions
-    # Supported regions: westus2, westeurope, southeastasia, eastus, westus
-    # If your Speech Service is in swedencentral, you need to create a new one
-    # in a supported region for avatar to work
-    
-    # For now, we'll try to use the configured region, but if it fails,
-    # you'll need to create a Speech Service in westus2, westeurope, or eastus
-    
-    avatar_region = config.settings.speech_region
-    
-    # Avatar feature requires specific regions - check if current region is supported
-    supported_avatar_regions = ['westus2', 'westeurope', 'southeastasia', 'eastus', 'westus']
-    
-    if avatar_region not in supported_avatar_regions:
-        logger.warning(f"Region '{avatar_region}' may not support Avatar feature. Supported regions: {supported_avatar_regions}")
-        # You could override to a supported region if you have a Speech Service there
-        # avatar_region = "westeurope"  # Uncomment and set if you have a service in this region
-    
-    return {
-        "subscription_key": config.settings.speech_key,
-        "region": avatar_region,
-        "supported_regions": supported_avatar_regions,
-        "current_region_supported": avatar_region in supported_avatar_regions,
-        "avatar_character": "Lisa",  # Try with capital L - some SDK versions are case-sensitive
-        "avatar_style": "casual-sitting",
-        "voice_name": "en-US-JennyNeural",
-        "video_format": "webm",
-        "video_codec": "vp9"
-    }
+    # Contains the subscription key, so it must not be cached by the browser or proxies
+    return Response(
+        content=_avatar_config(config.settings.speech_region, config.settings.speech_key),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"}
+    )
 
 
 @app.post("/api/session/start")
@@ -153,23 +274,22 @@ async def start_session():
     Returns:
         dict: Session information including session_id
     """
-    session_id = str(uuid.uuid4())
+    session_id = id_pool.next()
     
     session = PresentationSession(
         session_id=session_id,
         transcript="",
-        duration_seconds=0.0,
-        segments=[]
+        duration_seconds=0.0
     )
     
-    active_sessions[session_id] = session
+    await session_store.save(session)
     
-    logger.info(f"Started new session: {session_id}")
+    logger.info("Started new session: %s", session_id)
     
     return {
         "session_id": session_id,
         "status": "started",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 
@@ -180,79 +300,92 @@ async def analyze_presentation(session_id: str, transcript_data: dict):
     
     Args:
         session_id: Session identifier
-        transcript_data: Contains transcript, duration, and segments
+        transcript_data: Contains transcript and duration
         
     Returns:
         dict: Analysis report and coaching script
     """
-    if session_id not in active_sessions:
+    session = await session_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = active_sessions[session_id]
-    
-    # Update session with transcript data
-    session.transcript = transcript_data.get("transcript", "")
-    session.duration_seconds = transcript_data.get("duration", 0.0)
+    # Update session with transcript data (sessions are immutable; copy with changes)
+    session = session.model_copy(update={
+        "transcript": transcript_data.get("transcript", ""),
+        "duration_seconds": transcript_data.get("duration", 0.0)
+    })
     
     if not session.transcript.strip():
         raise HTTPException(status_code=400, detail="Empty transcript")
     
-    logger.info(f"Analyzing session {session_id}: {len(session.transcript)} characters")
+    logger.info("Analyzing session %s: %s characters", session_id, len(session.transcript))
     
     try:
-        # Analyze presentation
+        # Analyze presentation (section calls run concurrently inside)
         report = await sales_coach.analyze_presentation(session.transcript)
-        session.report = report
+        session = session.model_copy(update={"report": report})
         
-        # Generate coaching script for avatar
-        coaching_script = sales_coach.generate_coaching_script(report)
+        # The avatar script needs the report; persisting the session does not
+        # depend on the script, so the two overlap
+        coaching_script, _ = await asyncio.gather(
+            sales_coach.generate_coaching_script(report),
+            session_store.save(session),
+        )
         
-        logger.info(f"Analysis complete for session {session_id}")
+        logger.info("Analysis complete for session %s", session_id)
         
-        return {
+        return json_response({
             "session_id": session_id,
-            "report": report.model_dump(),
+            "report": report,
             "coaching_script": coaching_script,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": _now_iso()
+        })
         
     except Exception as e:
-        logger.error(f"Error analyzing session {session_id}: {e}")
+        logger.error("Error analyzing session %s: %s", session_id, e)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
 @app.post("/api/avatar/synthesize")
 async def synthesize_avatar(request_data: dict):
     """
-    Synthesize avatar video from coaching script.
+    Synthesize coaching script to speech.
     
     Args:
         request_data: Contains coaching_script text
         
     Returns:
-        dict: Avatar video URL or audio playback confirmation
+        StreamingResponse: MP3 audio streamed as it is synthesized
     """
     coaching_script = request_data.get("coaching_script", "")
     
     if not coaching_script.strip():
         raise HTTPException(status_code=400, detail="Empty coaching script")
     
-    logger.info(f"Synthesizing avatar for {len(coaching_script)} characters")
+    logger.info("Synthesizing avatar for %s characters", len(coaching_script))
+    
+    audio = avatar_service.synthesize_stream(coaching_script)
     
     try:
-        # For simplicity, synthesize to speaker
-        # In production, could synthesize to video file and return URL
-        avatar_service.synthesize_to_speaker(coaching_script)
-        
-        return {
-            "status": "success",
-            "message": "Coaching feedback delivered via audio",
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
+        # Wait for the first chunk so synthesis errors still map to a 500
+        first_chunk = await audio.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
     except Exception as e:
-        logger.error(f"Error synthesizing avatar: {e}")
+        logger.error("Error synthesizing avatar: %s", e)
         raise HTTPException(status_code=500, detail=f"Avatar synthesis failed: {str(e)}")
+    
+    async def stream_audio():
+        yield first_chunk
+        async for chunk in audio:
+            yield chunk
+    
+    # MP3 is already compressed; the identity encoding keeps GZip from re-encoding it
+    return StreamingResponse(
+        stream_audio(),
+        media_type="audio/mpeg",
+        headers={"Content-Encoding": "identity"}
+    )
 
 
 @app.get("/api/session/{session_id}/report")
@@ -266,21 +399,20 @@ async def get_session_report(session_id: str):
     Returns:
         dict: Session data including report
     """
-    if session_id not in active_sessions:
+    session = await session_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = active_sessions[session_id]
-    
     if not session.report:
         raise HTTPException(status_code=404, detail="Report not yet generated")
     
-    return {
+    return json_response({
         "session_id": session_id,
         "transcript": session.transcript,
         "duration_seconds": session.duration_seconds,
-        "report": session.report.model_dump(),
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "report": session.report,
+        "timestamp": _now_iso()
+    })
 
 
 @app.delete("/api/session/{session_id}")
@@ -291,9 +423,8 @@ async def delete_session(session_id: str):
     Args:
         session_id: Session identifier
     """
-    if session_id in active_sessions:
-        del active_sessions[session_id]
-        logger.info(f"Deleted session: {session_id}")
+    if await session_store.delete(session_id):
+        logger.info("Deleted session: %s", session_id)
         return {"status": "deleted", "session_id": session_id}
     
     raise HTTPException(status_code=404, detail="Session not found")
@@ -306,21 +437,22 @@ async def websocket_interactive_presentation(websocket: WebSocket):
     The avatar listens and responds naturally like a real customer.
     """
     await websocket.accept()
-    session_id = str(uuid.uuid4())
-    logger.info(f"Interactive session started: {session_id}")
+    session_id = id_pool.next()
+    logger.info("Interactive session started: %s", session_id)
     
-    # Track conversation
-    conversation_history = []
+    # Track conversation; only the last few turns are sent with each prompt
+    conversation_history = ConversationHistory()
+    started_at = asyncio.get_running_loop().time()
     greeting_sent = False
     
     try:
         while True:
             # Receive events from client
-            message = await websocket.receive_json()
+            message = orjson.loads(await websocket.receive_text())
             
             if message["type"] == "start_session":
                 # Send welcome message only when user is ready
-                await websocket.send_json({
+                await send_ws_json(websocket, {
                     "type": "avatar_speak",
                     "text": "Hi! I'm interested in learning about your product. Go ahead."
                 })
@@ -330,7 +462,7 @@ async def websocket_interactive_presentation(websocket: WebSocket):
             elif message["type"] == "transcript_update":
                 # Just receive, don't respond yet - wait for pause
                 presenter_text = message["text"]
-                logger.info(f"Received: {presenter_text}")
+                logger.debug("Received: %s", presenter_text)
                 
             elif message["type"] == "pause_detected":
                 # User paused - decide if avatar should speak
@@ -345,51 +477,42 @@ async def websocket_interactive_presentation(websocket: WebSocket):
                     logger.info("Waiting for greeting first")
                     continue
                 
-                logger.info(f"Considering response to: {recent_text[:100]}...")
+                logger.info("Considering response to: %.100s...", recent_text)
                 
                 # Use AI to decide how to respond
                 try:
-                    response = await sales_coach.generate_natural_response(
+                    # Forward each sentence as soon as it is generated so the
+                    # avatar starts speaking while the rest is still decoding
+                    sentences = []
+                    async for sentence in sales_coach.stream_natural_response(
                         recent_text,
                         conversation_history
-                    )
+                    ):
+                        await send_ws_json(websocket, {
+                            "type": "avatar_speak_partial",
+                            "text": sentence
+                        })
+                        sentences.append(sentence)
+                    response = " ".join(sentences)
                     
-                    # Only speak if there's actually something to say
+                    # Only record a reply if there was actually something said
                     if response and response.strip() and len(response) > 2:
-                        # Send response to avatar
-                        await websocket.send_json({
-                            "type": "avatar_speak",
-                            "text": response
-                        })
-                        
                         # Add to conversation history
-                        conversation_history.append({
-                            "speaker": "presenter",
-                            "text": recent_text
-                        })
-                        conversation_history.append({
-                            "speaker": "customer",
-                            "text": response
-                        })
+                        conversation_history.append("presenter", recent_text)
+                        conversation_history.append("customer", response)
                         
-                        logger.info(f"Avatar: {response}")
+                        logger.info("Avatar: %s", response)
                     else:
                         logger.info("Avatar chose to stay silent")
                         # Still add presenter's text to history even if no response
-                        conversation_history.append({
-                            "speaker": "presenter",
-                            "text": recent_text
-                        })
+                        conversation_history.append("presenter", recent_text)
                     
                 except Exception as e:
-                    logger.error(f"Error generating response: {e}")
+                    logger.error("Error generating response: %s", e)
             
             elif message["type"] == "end_presentation":
                 # Generate final coaching report
-                full_transcript = "\n".join([
-                    f"{h['speaker'].upper()}: {h['text']}" 
-                    for h in conversation_history
-                ])
+                full_transcript = conversation_history.transcript()
                 
                 logger.info("Generating final coaching report")
                 
@@ -407,18 +530,30 @@ async def websocket_interactive_presentation(websocket: WebSocket):
                         next_steps=[]
                     )
                 
-                await websocket.send_json({
+                await websocket.send_text(PAYLOAD_ADAPTER.dump_json({
                     "type": "coaching_report",
-                    "report": report.model_dump()
-                })
+                    "session_id": session_id,
+                    "report": report
+                }).decode())
+                
+                # Persist the full conversation once the client has its report
+                try:
+                    await session_store.save(PresentationSession(
+                        session_id=session_id,
+                        transcript=full_transcript,
+                        duration_seconds=asyncio.get_running_loop().time() - started_at,
+                        report=report
+                    ))
+                except Exception as e:
+                    logger.warning("Failed to persist interactive session %s: %s", session_id, e)
                 
                 logger.info("Interactive session completed")
                 break
                 
     except WebSocketDisconnect:
-        logger.info(f"Interactive session disconnected: {session_id}")
+        logger.info("Interactive session disconnected: %s", session_id)
     except Exception as e:
-        logger.error(f"Interactive session error: {e}")
+        logger.error("Interactive session error: %s", e)
         await websocket.close()
 
 
@@ -440,10 +575,10 @@ async def websocket_speech_endpoint(websocket: WebSocket):
             
             # Process audio chunk
             # In production, this would feed audio to Speech SDK streaming recognizer
-            logger.debug(f"Received audio chunk: {len(data)} bytes")
+            logger.debug("Received audio chunk: %s bytes", len(data))
             
             # Send back recognition result
-            await websocket.send_json({
+            await send_ws_json(websocket, {
                 "type": "partial",
                 "text": "Processing audio..."
             })
@@ -451,18 +586,32 @@ async def websocket_speech_endpoint(websocket: WebSocket):
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         await websocket.close()
 
 
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info("Starting uvicorn server")
+    # The reload watcher is only useful while developing and cannot run with workers;
+    # elsewhere run one worker (event loop) per core. Sessions live in Redis, so any
+    # worker can serve any request; without Redis they are per-process, so one worker.
+    reload = config.settings.environment == "development"
+    if reload or not config.settings.redis_url:
+        workers = 1
+    else:
+        workers = config.settings.web_workers or os.cpu_count() or 1
+    
+    logger.info("Starting uvicorn server with %s worker(s)", workers)
     uvicorn.run(
         "src.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        # "auto" picks uvloop/httptools when installed (not available on Windows)
+        loop="auto",
+        http="auto",
+        ws="websockets",
+        reload=reload,
+        workers=workers,
         log_level=config.settings.log_level.lower()
     )
@@ -1,12 +1,61 @@
 """
 Data models for sales coaching reports and analysis results.
 """
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+import os
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+
+# Schema examples only feed the OpenAPI docs; set INCLUDE_EXAMPLES=false to drop them
+INCLUDE_EXAMPLES = os.getenv("INCLUDE_EXAMPLES", "true").lower() in ("1", "true", "yes")
+
+_REPORT_EXAMPLE = {
+    "overall_score": 7,
+    "performance_level": "good",
+    "criteria_scores": {
+        "value_proposition": 8,
+        "objection_handling": 6,
+        "active_listening": 7,
+        "question_quality": 6,
+        "call_to_action": 8,
+        "engagement": 7,
+        "rule_compliance": 6
+    },
+    "strengths": [
+        "Clear articulation of product benefits with specific ROI examples",
+        "Strong opening with structured agenda",
+        "Confident closing with clear next steps"
+    ],
+    "improvements": [
+        {
+            "area": "Filler Words",
+            "current_state": "Frequent use of 'um' and 'like' reduced confidence",
+            "recommendation": "Practice pausing instead of using filler words",
+            "example": "So, um, like, our solution is, you know, really effective"
+        }
+    ],
+    "rule_violations": [
+        {
+            "rule_category": "company_wording",
+            "rule_name": "preferred_terms",
+            "severity": "medium",
+            "description": "Used 'cheap' instead of preferred company terminology",
+            "example": "This is a cheap solution",
+            "suggestion": "Use 'cost-effective' or 'competitive pricing' instead"
+        }
+    ],
+    "summary": "Solid presentation with clear value proposition and strong call-to-action. Main improvement area is reducing filler words for more confident delivery.",
+    "next_steps": [
+        "Practice presentation without filler words - record and review",
+        "Prepare more open-ended discovery questions",
+        "Review company terminology guide for preferred wording"
+    ]
+}
 
 
 class ImprovementItem(BaseModel):
     """Represents a specific area for improvement."""
+    model_config = ConfigDict(frozen=True, extra='forbid', str_strip_whitespace=True)
+    
     area: str = Field(..., description="Category of improvement (e.g., 'Filler Words', 'Value Proposition')")
     current_state: str = Field(..., description="What was observed in the presentation")
     recommendation: str = Field(..., description="Specific action to take for improvement")
@@ -15,6 +64,8 @@ class ImprovementItem(BaseModel):
 
 class RuleViolation(BaseModel):
     """Represents a violation of custom rules."""
+    model_config = ConfigDict(frozen=True, extra='forbid', str_strip_whitespace=True)
+    
     rule_category: str = Field(..., description="Category of rule violated (e.g., 'politeness', 'company_wording')")
     rule_name: str = Field(..., description="Specific rule that was violated")
     severity: str = Field(..., description="Severity level: 'low', 'medium', 'high'")
@@ -25,6 +76,8 @@ class RuleViolation(BaseModel):
 
 class CriteriaScores(BaseModel):
     """Detailed scores for each evaluation criterion."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     value_proposition: float = Field(..., ge=1, le=10, description="Clarity and strength of value proposition")
     objection_handling: float = Field(..., ge=1, le=10, description="Quality of addressing concerns")
     active_listening: float = Field(..., ge=1, le=10, description="Demonstration of understanding customer needs")
@@ -36,6 +89,11 @@ class CriteriaScores(BaseModel):
 
 class SalesCoachingReport(BaseModel):
     """Comprehensive sales coaching analysis report."""
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={"example": _REPORT_EXAMPLE} if INCLUDE_EXAMPLES else None
+    )
+    
     overall_score: float = Field(..., ge=1, le=10, description="Overall presentation effectiveness score")
     performance_level: str = Field(..., description="Performance category: excellent, good, fair, needs_improvement")
     criteria_scores: CriteriaScores = Field(..., description="Detailed scores for each criterion")
@@ -44,52 +102,26 @@ class SalesCoachingReport(BaseModel):
     rule_violations: List[RuleViolation] = Field(default_factory=list, description="Custom rule violations detected")
     summary: str = Field(..., description="2-3 sentence overall assessment")
     next_steps: List[str] = Field(..., description="Actionable next steps for improvement")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "overall_score": 7,
-                "performance_level": "good",
-                "criteria_scores": {
-                    "value_proposition": 8,
-                    "objection_handling": 6,
-                    "active_listening": 7,
-                    "question_quality": 6,
-                    "call_to_action": 8,
-                    "engagement": 7,
-                    "rule_compliance": 6
-                },
-                "strengths": [
-                    "Clear articulation of product benefits with specific ROI examples",
-                    "Strong opening with structured agenda",
-                    "Confident closing with clear next steps"
-                ],
-                "improvements": [
-                    {
-                        "area": "Filler Words",
-                        "current_state": "Frequent use of 'um' and 'like' reduced confidence",
-                        "recommendation": "Practice pausing instead of using filler words",
-                        "example": "So, um, like, our solution is, you know, really effective"
-                    }
-                ],
-                "rule_violations": [
-                    {
-                        "rule_category": "company_wording",
-                        "rule_name": "preferred_terms",
-                        "severity": "medium",
-                        "description": "Used 'cheap' instead of preferred company terminology",
-                        "example": "This is a cheap solution",
-                        "suggestion": "Use 'cost-effective' or 'competitive pricing' instead"
-                    }
-                ],
-                "summary": "Solid presentation with clear value proposition and strong call-to-action. Main improvement area is reducing filler words for more confident delivery.",
-                "next_steps": [
-                    "Practice presentation without filler words - record and review",
-                    "Prepare more open-ended discovery questions",
-                    "Review company terminology guide for preferred wording"
-                ]
-            }
-        }
+
+
+class ScoresSection(BaseModel):
+    """Scoring section of a coaching report, produced by its own analysis call."""
+    overall_score: float = Field(..., ge=1, le=10, description="Overall presentation effectiveness score")
+    performance_level: str = Field(..., description="Performance category: excellent, good, fair, needs_improvement")
+    criteria_scores: CriteriaScores = Field(..., description="Detailed scores for each criterion")
+
+
+class FeedbackSection(BaseModel):
+    """Qualitative feedback section of a coaching report."""
+    strengths: List[str] = Field(..., description="List of things done well in the presentation")
+    improvements: List[ImprovementItem] = Field(..., description="Specific areas for improvement with recommendations")
+    summary: str = Field(..., description="2-3 sentence overall assessment")
+    next_steps: List[str] = Field(..., description="Actionable next steps for improvement")
+
+
+class RuleViolationsSection(BaseModel):
+    """Rule compliance section of a coaching report."""
+    rule_violations: List[RuleViolation] = Field(default_factory=list, description="Custom rule violations detected")
 
 
 class TranscriptSegment(BaseModel):
@@ -101,8 +133,10 @@ class TranscriptSegment(BaseModel):
 
 class PresentationSession(BaseModel):
     """Complete presentation session data."""
+    # Unknown keys (e.g. segments in sessions stored by older versions) are ignored
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     session_id: str = Field(..., description="Unique session identifier")
     transcript: str = Field(..., description="Full presentation transcript")
     duration_seconds: float = Field(..., description="Total presentation duration")
-    segments: List[TranscriptSegment] = Field(default_factory=list, description="Individual transcript segments")
     report: Optional[SalesCoachingReport] = Field(None, description="Generated coaching report")
@@ -0,0 +1,117 @@
+"""
+msgspec mirrors of the coaching report models for the analysis hot path.
+
+LLM responses are decoded and validated with these structs, which is much
+cheaper than Pydantic. The Pydantic models in src.models.report remain the
+API boundary (FastAPI responses, sessions); to_report converts without
+re-validating.
+"""
+from typing import Annotated, Any, Dict, List, Optional
+import msgspec
+
+from src.models.report import (
+    SalesCoachingReport, CriteriaScores, ImprovementItem, RuleViolation,
+)
+
+Score = Annotated[float, msgspec.Meta(ge=1, le=10)]
+
+
+class ImprovementItemStruct(msgspec.Struct, kw_only=True, frozen=True):
+    """Mirror of ImprovementItem."""
+    area: str
+    current_state: str
+    recommendation: str
+    example: Optional[str] = None
+
+
+class RuleViolationStruct(msgspec.Struct, kw_only=True, frozen=True):
+    """Mirror of RuleViolation."""
+    rule_category: str
+    rule_name: str
+    severity: str
+    description: str
+    example: Optional[str] = None
+    suggestion: str
+
+
+class CriteriaScoresStruct(msgspec.Struct, kw_only=True, frozen=True):
+    """Mirror of CriteriaScores."""
+    value_proposition: Score
+    objection_handling: Score
+    active_listening: Score
+    question_quality: Score
+    call_to_action: Score
+    engagement: Score
+    rule_compliance: Score
+
+
+class ScoresSectionStruct(msgspec.Struct, kw_only=True):
+    """Mirror of ScoresSection."""
+    overall_score: Score
+    performance_level: str
+    criteria_scores: CriteriaScoresStruct
+
+
+class FeedbackSectionStruct(msgspec.Struct, kw_only=True):
+    """Mirror of FeedbackSection."""
+    strengths: List[str]
+    improvements: List[ImprovementItemStruct]
+    summary: str
+    next_steps: List[str]
+
+
+class RuleViolationsSectionStruct(msgspec.Struct, kw_only=True):
+    """Mirror of RuleViolationsSection."""
+    rule_violations: List[RuleViolationStruct] = []
+
+
+# Decoders are built once; they validate while parsing in a single pass
+SCORES_DECODER = msgspec.json.Decoder(ScoresSectionStruct)
+FEEDBACK_DECODER = msgspec.json.Decoder(FeedbackSectionStruct)
+RULE_VIOLATIONS_DECODER = msgspec.json.Decoder(RuleViolationsSectionStruct)
+
+
+def _stripped(struct: msgspec.Struct) -> Dict[str, Any]:
+    """
+    Struct fields as a dict with string values stripped.
+
+    model_construct skips validation, so str_strip_whitespace on the Pydantic
+    models does not apply; this does the same stripping up front.
+    """
+    return {
+        name: value.strip() if isinstance(value, str) else value
+        for name, value in msgspec.structs.asdict(struct).items()
+    }
+
+
+def to_report(
+    scores: ScoresSectionStruct,
+    feedback: FeedbackSectionStruct,
+    violations: RuleViolationsSectionStruct,
+) -> SalesCoachingReport:
+    """
+    Assemble a Pydantic SalesCoachingReport from decoded sections.
+
+    The sections were already validated by msgspec, so the Pydantic models are
+    built with model_construct and skip a second validation pass. Improvement and
+    rule violation strings are stripped here to match their models'
+    str_strip_whitespace setting.
+    """
+    return SalesCoachingReport.model_construct(
+        overall_score=scores.overall_score,
+        performance_level=scores.performance_level,
+        criteria_scores=CriteriaScores.model_construct(
+            **msgspec.structs.asdict(scores.criteria_scores)
+        ),
+        strengths=feedback.strengths,
+        improvements=[
+            ImprovementItem.model_construct(**_stripped(item))
+            for item in feedback.improvements
+        ],
+        rule_violations=[
+            RuleViolation.model_construct(**_stripped(violation))
+            for violation in violations.rule_violations
+        ],
+        summary=feedback.summary,
+        next_steps=feedback.next_steps,
+    )
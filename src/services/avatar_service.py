@@ -1,14 +1,249 @@
 """
 Azure Speech Service Avatar integration for delivering coaching feedback.
 """
+import asyncio
+import hashlib
+import html
 import logging
-from typing import Optional
+import os
+import queue
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape
+from typing import Optional, AsyncIterator, Callable, Iterator, Tuple
+import httpx
 import azure.cognitiveservices.speech as speechsdk
 
-from src.config import config
+from src.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Speech REST synthesis streams audio back while it is generated
+TTS_REST_URL = "https://{region}.tts.speech.microsoft.com/cognitiveservices/v1"
+TTS_OUTPUT_FORMAT = "audio-24khz-48kbitrate-mono-mp3"
+TTS_CHUNK_SIZE = 4096
+
+# SDK audio streams are read in 16000-byte chunks (0.5 s of 16 kHz 16-bit mono)
+AUDIO_CHUNK_SIZE = 16000
+
+
+AVATAR_SSML_TEMPLATE = """<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' 
+       xmlns:mstts='https://www.w3.org/2001/mstts' xml:lang='en-US'>
+    <voice name='{voice_name}'>
+        <mstts:ttsembedding speakerProfileId='avatar'>
+            <mstts:express-as style="friendly">
+                {text}
+            </mstts:express-as>
+        </mstts:ttsembedding>
+    </voice>
+</speak>"""
+
+COACHING_SSML_TEMPLATE = """<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis'
+       xmlns:mstts='https://www.w3.org/2001/mstts' xml:lang='en-US'>
+    <voice name='{voice_name}'>
+        <mstts:express-as style="friendly">
+            <prosody rate="0.95" pitch="+5%">
+                {text}
+            </prosody>
+        </mstts:express-as>
+    </voice>
+</speak>"""
+
+
+DEFAULT_VOICE_NAME = "en-US-JennyNeural"
+
+
+@lru_cache(maxsize=1)
+def _get_speech_config() -> speechsdk.SpeechConfig:
+    """
+    Build the synthesis SpeechConfig once per process.
+    
+    Returns:
+        speechsdk.SpeechConfig: Shared configuration with the default voice set
+    """
+    config = get_config()
+    speech_config = speechsdk.SpeechConfig(
+        subscription=config.settings.speech_key,
+        region=config.settings.speech_region
+    )
+    speech_config.speech_synthesis_voice_name = DEFAULT_VOICE_NAME
+    return speech_config
+
+
+# Sentence ends: terminal punctuation followed by whitespace
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+SENTENCE_BREAK = '<break time="250ms"/>'
+
+AVATAR_EMBED_TEMPLATE = """
+<div class="avatar-container">
+    <video id="avatarVideo" width="640" height="360" controls autoplay>
+        <source src="{video_url}" type="video/mp4">
+        Your browser does not support the video tag.
+    </video>
+</div>
+"""
+
+
+# Quotes are escaped too, in addition to escape()'s default &, < and >
+SSML_ENTITIES = {'"': "&quot;", "'": "&apos;"}
+
+
+class SynthesizerPool:
+    """
+    Pool of reusable SpeechSynthesizer instances with warm service connections.
+    
+    Creating a synthesizer per request pays the WebSocket/TLS handshake every
+    time; pooled synthesizers keep their connection open between requests.
+    Synthesizers idle for longer than idle_connection_timeout are dropped on
+    acquire, since the service closes idle connections anyway.
+    """
+    
+    def __init__(
+        self,
+        speech_config: speechsdk.SpeechConfig,
+        audio_config_factory: Optional[Callable[[], speechsdk.audio.AudioOutputConfig]] = None,
+        max_connections: int = 4,
+        idle_connection_timeout: float = 300.0,
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            speech_config: Speech configuration for new synthesizers
+            audio_config_factory: Builds the audio output for new synthesizers;
+                None keeps audio in memory (result.audio_data)
+            max_connections: Maximum synthesizers in use at once
+            idle_connection_timeout: Seconds after which an idle synthesizer is recycled
+        """
+        self.speech_config = speech_config
+        self.audio_config_factory = audio_config_factory
+        self.idle_connection_timeout = idle_connection_timeout
+        self._idle: "queue.LifoQueue[Tuple[speechsdk.SpeechSynthesizer, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+    
+    def _create(self) -> speechsdk.SpeechSynthesizer:
+        """Create a synthesizer and open its service connection up front."""
+        audio_config = self.audio_config_factory() if self.audio_config_factory else None
+        synthesizer = speechsdk.SpeechSynthesizer(
+            speech_config=self.speech_config,
+            audio_config=audio_config
+        )
+        speechsdk.Connection.from_speech_synthesizer(synthesizer).open(True)
+        return synthesizer
+    
+    def prewarm(self, count: int):
+        """Create count synthesizers ahead of the first request."""
+        for _ in range(count):
+            self._idle.put((self._create(), time.monotonic()))
+    
+    def checkout(self) -> speechsdk.SpeechSynthesizer:
+        """
+        Take a synthesizer from the pool, creating one if none is idle.
+        
+        Blocks while max_connections synthesizers are checked out. Every
+        checkout must be paired with a checkin.
+        """
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    synthesizer, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if time.monotonic() - last_used <= self.idle_connection_timeout:
+                    return synthesizer
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def checkin(self, synthesizer: speechsdk.SpeechSynthesizer, reusable: bool = True):
+        """Return a synthesizer; pass reusable=False to drop one left in a bad state."""
+        if reusable:
+            self._idle.put((synthesizer, time.monotonic()))
+        self._slots.release()
+    
+    @contextmanager
+    def acquire(self) -> Iterator[speechsdk.SpeechSynthesizer]:
+        """Borrow a synthesizer; it returns to the pool unless the caller raised."""
+        synthesizer = self.checkout()
+        reusable = False
+        try:
+            yield synthesizer
+            reusable = True
+        finally:
+            self.checkin(synthesizer, reusable)
+
+
+class TTSCache:
+    """
+    Content-addressed cache of synthesized audio.
+    
+    Entries are keyed by SHA-256 of (voice, style, avatar, normalized text) and
+    stored as files under cache_dir. Hits refresh a file's mtime; once the cache
+    holds more than max_files entries the least recently used files are deleted.
+    """
+    
+    TMP_SUFFIX = ".tmp"
+    
+    def __init__(self, cache_dir: str, max_files: int = 256):
+        self.cache_dir = Path(cache_dir)
+        self.max_files = max_files
+    
+    @staticmethod
+    def key(text: str, voice: str, style: str, avatar: str) -> str:
+        """Build the cache key for a synthesis request."""
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{voice}|{style}|{avatar}|{normalized}".encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached file for key, if present."""
+        path = self.cache_dir / key
+        try:
+            # Touch on hit so eviction drops the least recently used entries
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+    
+    def put(self, key: str, audio: bytes) -> Path:
+        """Store audio for key and return its cache file."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / key
+        # Write to a unique temp file, then rename, so concurrent writers never
+        # share a temp file and readers never see a partial one
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=self.TMP_SUFFIX, delete=False) as tmp:
+            tmp.write(audio)
+        os.replace(tmp.name, path)
+        self._evict()
+        return path
+    
+    def _evict(self):
+        """Delete the least recently used files beyond max_files."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(self.TMP_SUFFIX):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+        
+        if len(entries) <= self.max_files:
+            return
+        
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
 
 class AvatarService:
     """
@@ -16,12 +251,20 @@ class AvatarService:
     Generates avatar video delivering coaching feedback.
     """
     
-    def __init__(self):
-        """Initialize Avatar Service with Azure credentials."""
-        self.speech_config = speechsdk.SpeechConfig(
-            subscription=config.settings.speech_key,
-            region=config.settings.speech_region
-        )
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize Avatar Service with Azure credentials.
+        
+        Args:
+            http_client: Shared HTTP client for Speech REST requests
+        """
+        config = get_config()
+        # A client created here is owned (and closed) by this service
+        self._owns_http = http_client is None
+        self.http = http_client or httpx.AsyncClient()
+        self.tts_url = TTS_REST_URL.format(region=config.settings.speech_region)
+        self.speech_key = config.settings.speech_key
+        self.speech_config = _get_speech_config()
         
         # Configure avatar settings
         # Available avatars: lisa, anna, james, tony, etc.
@@ -30,7 +273,36 @@ class AvatarService:
         self.avatar_style = "graceful-sitting"  # Avatar pose/style
         
         # Configure voice
-        self.speech_config.speech_synthesis_voice_name = "en-US-JennyNeural"
+        self.voice_name = DEFAULT_VOICE_NAME
+        
+        # SSML templates with the voice filled in; only {text} varies per call
+        self._avatar_ssml_template = AVATAR_SSML_TEMPLATE.format(voice_name=self.voice_name, text="{text}")
+        self._coaching_ssml_template = COACHING_SSML_TEMPLATE.format(voice_name=self.voice_name, text="{text}")
+        
+        # Reusable synthesizers: in-memory output for files, default speaker for local playback
+        self.stream_pool = SynthesizerPool(
+            self.speech_config,
+            max_connections=config.settings.tts_pool_size,
+            idle_connection_timeout=config.settings.tts_idle_timeout_seconds
+        )
+        self.speaker_pool = SynthesizerPool(
+            self.speech_config,
+            audio_config_factory=lambda: speechsdk.audio.AudioOutputConfig(use_default_speaker=True),
+            max_connections=config.settings.tts_pool_size,
+            idle_connection_timeout=config.settings.tts_idle_timeout_seconds
+        )
+        self.tts_cache = TTSCache(
+            config.settings.tts_cache_dir,
+            max_files=config.settings.tts_cache_max_files
+        )
+        
+        # Async callers queue here instead of piling up in executor threads or
+        # flooding the service with concurrent synthesis requests
+        self._synth_semaphore = asyncio.Semaphore(config.settings.max_concurrent_syntheses)
+        try:
+            self.stream_pool.prewarm(1)
+        except Exception as e:
+            logger.warning(f"Could not prewarm speech synthesizer: {e}")
         
     def synthesize_to_avatar_video(self, text: str, output_file: str = "coaching_feedback.mp4") -> str:
         """
@@ -45,36 +317,157 @@ class AvatarService:
         """
         logger.info(f"Synthesizing avatar video: {len(text)} characters")
         
-        try:
-            # Configure audio output to file
-            audio_config = speechsdk.audio.AudioOutputConfig(filename=output_file)
+        cache_key = self._avatar_cache_key(text)
+        cached = self.tts_cache.get(cache_key)
+        if cached is not None:
+            try:
+                # copyfile uses sendfile on Linux, so the bytes never enter Python
+                shutil.copyfile(cached, output_file)
+                logger.info(f"Avatar video served from cache: {output_file}")
+                return output_file
+            except FileNotFoundError:
+                # Evicted by another worker since the lookup
+                pass
+        
+        audio = self._synthesize_avatar(text, cache_key)
+        with open(output_file, "wb") as f:
+            f.write(memoryview(audio))
+        logger.info(f"Avatar video synthesized successfully: {output_file}")
+        return output_file
+    
+    def synthesize_avatar_audio(self, text: str) -> bytes:
+        """
+        Synthesize coaching script and return the audio in memory.
+        
+        Use this when the result is sent straight to a client (e.g. a
+        StreamingResponse) to avoid writing and re-reading an output file.
+        
+        Args:
+            text: Coaching script text to synthesize
             
-            # Create synthesizer
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
+        Returns:
+            bytes: Synthesized audio
+        """
+        cache_key = self._avatar_cache_key(text)
+        cached = self.tts_cache.get(cache_key)
+        if cached is not None:
+            try:
+                return cached.read_bytes()
+            except FileNotFoundError:
+                # Evicted by another worker since the lookup
+                pass
+        return self._synthesize_avatar(text, cache_key)
+    
+    def _avatar_cache_key(self, text: str) -> str:
+        """Cache key for text spoken with the current avatar settings."""
+        return TTSCache.key(
+            text,
+            self.voice_name,
+            self.avatar_style,
+            self.avatar_character
+        )
+    
+    def _synthesize_avatar(self, text: str, cache_key: str) -> bytes:
+        """
+        Synthesize text on a pooled synthesizer and store the result in the cache.
+        
+        Args:
+            text: Coaching script text to synthesize
+            cache_key: Cache key for the result
             
+        Returns:
+            bytes: Synthesized audio
+        """
+        try:
             # Create SSML with avatar configuration
             ssml = self._create_avatar_ssml(text)
             
-            # Synthesize
-            result = synthesizer.speak_ssml_async(ssml).get()
+            # Synthesize on a pooled (warm) synthesizer; audio is kept in memory
+            # so the synthesizer is not bound to one output file
+            with self.stream_pool.acquire() as synthesizer:
+                result = synthesizer.speak_ssml_async(ssml).get()
             
             if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                logger.info(f"Avatar video synthesized successfully: {output_file}")
-                return output_file
+                self.tts_cache.put(cache_key, result.audio_data)
+                return result.audio_data
             elif result.reason == speechsdk.ResultReason.Canceled:
                 cancellation = result.cancellation_details
                 logger.error(f"Synthesis canceled: {cancellation.reason}")
                 if cancellation.reason == speechsdk.CancellationReason.Error:
                     logger.error(f"Error details: {cancellation.error_details}")
                 raise Exception(f"Avatar synthesis failed: {cancellation.error_details}")
+            raise Exception(f"Avatar synthesis failed: {result.reason}")
             
         except Exception as e:
             logger.error(f"Error during avatar synthesis: {e}")
             raise
     
+    async def stream_avatar_audio(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Synthesize coaching script with avatar configuration, yielding audio
+        chunks as the service produces them instead of waiting for the whole clip.
+        
+        Blocking SDK calls run in worker threads so the event loop stays free.
+        
+        Args:
+            text: Coaching script text to synthesize
+            
+        Yields:
+            bytes: Audio chunks
+        """
+        logger.info(f"Streaming avatar audio: {len(text)} characters")
+        
+        ssml = self._create_avatar_ssml(text)
+        
+        async with self._synth_semaphore:
+            synthesizer = await self._checkout_stream_synthesizer()
+            completed = False
+            
+            try:
+                # Returns once synthesis has started; audio keeps arriving on the stream
+                result = await asyncio.to_thread(lambda: synthesizer.start_speaking_ssml_async(ssml).get())
+                if result.reason == speechsdk.ResultReason.Canceled:
+                    cancellation = result.cancellation_details
+                    raise Exception(f"Avatar synthesis failed: {cancellation.error_details}")
+                
+                stream = speechsdk.AudioDataStream(result)
+                buffer = bytes(AUDIO_CHUNK_SIZE)
+                while (filled := await asyncio.to_thread(stream.read_data, buffer)) > 0:
+                    yield buffer[:filled]
+                
+                if stream.status == speechsdk.StreamStatus.Canceled:
+                    raise Exception(f"Avatar synthesis failed: {stream.cancellation_details.error_details}")
+                completed = True
+                
+            finally:
+                # A synthesizer abandoned mid-stream may still be speaking; do not reuse it
+                self.stream_pool.checkin(synthesizer, reusable=completed)
+    
+    async def _checkout_stream_synthesizer(self) -> speechsdk.SpeechSynthesizer:
+        """
+        Check out a stream synthesizer without blocking the event loop.
+        
+        The checkout thread cannot be interrupted, so if the caller is cancelled
+        while waiting, the synthesizer it eventually gets is returned to the pool
+        instead of leaking a slot.
+        """
+        checkout = asyncio.ensure_future(asyncio.to_thread(self.stream_pool.checkout))
+        try:
+            return await asyncio.shield(checkout)
+        except asyncio.CancelledError:
+            checkout.add_done_callback(self._checkin_abandoned)
+            raise
+    
+    def _checkin_abandoned(self, checkout: "asyncio.Future[speechsdk.SpeechSynthesizer]"):
+        """Return a synthesizer whose requester was cancelled during checkout."""
+        if not checkout.cancelled() and checkout.exception() is None:
+            self.stream_pool.checkin(checkout.result())
+    
+    async def aclose(self):
+        """Close the HTTP client if this service created it."""
+        if self._owns_http:
+            await self.http.aclose()
+    
     def synthesize_to_speaker(self, text: str):
         """
         Synthesize coaching script directly to speakers (for testing).
@@ -85,12 +478,10 @@ class AvatarService:
         logger.info(f"Synthesizing to speaker: {len(text)} characters")
         
         try:
-            # Use default speaker
-            synthesizer = speechsdk.SpeechSynthesizer(speech_config=self.speech_config)
-            
-            # Synthesize with prosody for natural delivery
+            # Synthesize with prosody for natural delivery on a pooled speaker synthesizer
             ssml = self._create_coaching_ssml(text)
-            result = synthesizer.speak_ssml_async(ssml).get()
+            with self.speaker_pool.acquire() as synthesizer:
+                result = synthesizer.speak_ssml_async(ssml).get()
             
             if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
                 logger.info("Speech synthesized successfully")
@@ -104,48 +495,59 @@ class AvatarService:
             logger.error(f"Error during speech synthesis: {e}")
             raise
     
+    async def synthesize_stream(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Synthesize coaching script with the Speech REST API, yielding MP3 chunks
+        as they arrive so playback can start before synthesis completes.
+        
+        Args:
+            text: Coaching script text to synthesize
+            
+        Yields:
+            bytes: Audio chunks (audio/mpeg)
+        """
+        logger.info(f"Streaming synthesis: {len(text)} characters")
+        
+        headers = {
+            "Ocp-Apim-Subscription-Key": self.speech_key,
+            "Content-Type": "application/ssml+xml",
+            "X-Microsoft-OutputFormat": TTS_OUTPUT_FORMAT,
+            "User-Agent": "ai-sales-coach",
+        }
+        ssml = self._create_coaching_ssml(text)
+        
+        async with self._synth_semaphore:
+            async with self.http.stream("POST", self.tts_url, content=ssml, headers=headers) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(TTS_CHUNK_SIZE):
+                    yield chunk
+    
+    @staticmethod
+    def _safe_ssml(template: str, text: str) -> str:
+        """Fill an SSML template with XML-escaped text so &, < and quotes cannot break it."""
+        return template.format(text=escape(text, SSML_ENTITIES))
+    
     def _create_avatar_ssml(self, text: str) -> str:
         """
         Create SSML with avatar configuration.
         
         Note: Avatar SSML format is in preview and may require specific SDK versions.
         For production, refer to latest Azure documentation.
-        """
-        voice_name = self.speech_config.speech_synthesis_voice_name
         
-        ssml = f"""
-<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' 
-       xmlns:mstts='https://www.w3.org/2001/mstts' xml:lang='en-US'>
-    <voice name='{voice_name}'>
-        <mstts:ttsembedding speakerProfileId='avatar'>
-            <mstts:express-as style="friendly">
-                {text}
-            </mstts:express-as>
-        </mstts:ttsembedding>
-    </voice>
-</speak>
-"""
-        return ssml.strip()
+        Each sentence becomes its own <s> element with a short pause between
+        them, so multi-sentence scripts are paced for comprehension.
+        """
+        sentences = [sentence for sentence in SENTENCE_SPLIT_RE.split(text.strip()) if sentence]
+        body = SENTENCE_BREAK.join(
+            f"<s>{escape(sentence, SSML_ENTITIES)}</s>" for sentence in sentences
+        )
+        return self._avatar_ssml_template.format(text=body)
     
     def _create_coaching_ssml(self, text: str) -> str:
         """
         Create SSML for coaching delivery with appropriate prosody.
         """
-        voice_name = self.speech_config.speech_synthesis_voice_name
-        
-        ssml = f"""
-<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis'
-       xmlns:mstts='https://www.w3.org/2001/mstts' xml:lang='en-US'>
-    <voice name='{voice_name}'>
-        <mstts:express-as style="friendly">
-            <prosody rate="0.95" pitch="+5%">
-                {text}
-            </prosody>
-        </mstts:express-as>
-    </voice>
-</speak>
-"""
-        return ssml.strip()
+        return self._safe_ssml(self._coaching_ssml_template, text)
     
     async def get_realtime_avatar_config(self) -> dict:
         """
@@ -162,8 +564,8 @@ class AvatarService:
         return {
             "avatarCharacter": self.avatar_character,
             "avatarStyle": self.avatar_style,
-            "voiceName": self.speech_config.speech_synthesis_voice_name,
-            "region": config.settings.speech_region,
+            "voiceName": self.voice_name,
+            "region": get_config().settings.speech_region,
             # In production, this would include ICE servers, authentication tokens, etc.
             "mode": "realtime",
             "videoFormat": {
@@ -183,15 +585,8 @@ class AvatarService:
         Returns:
             str: HTML code for video player
         """
-        html = f"""
-<div class="avatar-container">
-    <video id="avatarVideo" width="640" height="360" controls autoplay>
-        <source src="{video_url}" type="video/mp4">
-        Your browser does not support the video tag.
-    </video>
-</div>
-"""
-        return html
+        # Escaped so a URL containing quotes or markup cannot break out of src
+        return AVATAR_EMBED_TEMPLATE.format(video_url=html.escape(video_url, quote=True))
 
 
 class RealTimeAvatarConnection:
@@ -204,10 +599,7 @@ class RealTimeAvatarConnection:
     
     def __init__(self):
         """Initialize real-time avatar connection."""
-        self.speech_config = speechsdk.SpeechConfig(
-            subscription=config.settings.speech_key,
-            region=config.settings.speech_region
-        )
+        self.speech_config = _get_speech_config()
         self.connection = None
         self.is_connected = False
     
@@ -222,6 +614,7 @@ class RealTimeAvatarConnection:
         
         # This would use Azure Speech SDK's avatar real-time API
         # For now, return configuration that frontend can use
+        config = get_config()
         
         connection_info = {
             "status": "connected",
@@ -0,0 +1,109 @@
+"""
+Redis-backed store for presentation sessions.
+"""
+import logging
+import time
+from typing import Dict, Optional, Tuple
+import redis.asyncio as redis
+
+from src.config import get_config
+from src.models.report import PresentationSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """
+    Stores PresentationSession objects as JSON in Redis with TTL eviction.
+    Keeping sessions out of process memory lets the API run multiple workers
+    without sticky routing.
+    
+    When no Redis URL is configured, sessions are kept in a process-local dict
+    instead; that only works with a single worker.
+    """
+    
+    KEY_PREFIX = "sess:"
+    
+    def __init__(self):
+        """Initialize the Redis connection pool from configuration."""
+        config = get_config()
+        self.ttl_seconds = config.settings.session_ttl_seconds
+        self.redis: Optional[redis.Redis] = None
+        self._local: Dict[str, Tuple[float, str]] = {}
+        
+        if config.settings.redis_url:
+            self.redis = redis.Redis.from_url(
+                config.settings.redis_url,
+                max_connections=config.settings.redis_pool_size,
+            )
+        else:
+            logger.warning("REDIS_URL not set; storing sessions in process memory (single worker only)")
+    
+    def _key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}"
+    
+    async def save(self, session: PresentationSession):
+        """
+        Store a session, resetting its TTL.
+        
+        Args:
+            session: Session to store
+        """
+        if self.redis is None:
+            now = time.monotonic()
+            # Drop expired sessions that were never read again
+            for session_id in [key for key, (expires_at, _) in self._local.items() if expires_at < now]:
+                del self._local[session_id]
+            self._local[session.session_id] = (now + self.ttl_seconds, session.model_dump_json())
+            return
+        
+        await self.redis.set(
+            self._key(session.session_id),
+            session.model_dump_json(),
+            ex=self.ttl_seconds
+        )
+    
+    async def get(self, session_id: str) -> Optional[PresentationSession]:
+        """
+        Load a session.
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            PresentationSession or None if it does not exist or has expired
+        """
+        if self.redis is None:
+            entry = self._local.get(session_id)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at < time.monotonic():
+                del self._local[session_id]
+                return None
+            return PresentationSession.model_validate_json(data)
+        
+        data = await self.redis.get(self._key(session_id))
+        if data is None:
+            return None
+        return PresentationSession.model_validate_json(data)
+    
+    async def delete(self, session_id: str) -> bool:
+        """
+        Delete a session.
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            bool: True if the session existed
+        """
+        if self.redis is None:
+            return self._local.pop(session_id, None) is not None
+        
+        return await self.redis.delete(self._key(session_id)) > 0
+    
+    async def aclose(self):
+        """Close the Redis connection pool."""
+        if self.redis is not None:
+            await self.redis.aclose()
@@ -3,14 +3,24 @@ Azure Speech Service integration for real-time speech-to-text.
 """
 import asyncio
 import logging
-from typing import List, Callable, Optional
+import time
+from collections import deque
+from typing import Deque, List, Callable, Optional, AsyncIterator
 import azure.cognitiveservices.speech as speechsdk
 
-from src.config import config
+from src.config import get_config
 from src.models.report import TranscriptSegment
 
 logger = logging.getLogger(__name__)
 
+# Pushed audio must be 16 kHz, 16-bit mono PCM
+PCM_SAMPLES_PER_SECOND = 16000
+PCM_BYTES_PER_SECOND = PCM_SAMPLES_PER_SECOND * 2
+
+RECOGNITION_PROPERTIES = {
+    speechsdk.PropertyId.SpeechServiceResponse_RequestSentenceBoundary: "true",
+}
+
 
 class SpeechService:
     """
@@ -18,38 +28,77 @@ class SpeechService:
     Supports continuous recognition with callback-based transcript accumulation.
     """
     
-    def __init__(self):
-        """Initialize Speech Service with Azure credentials."""
+    def __init__(self, detailed: bool = False):
+        """
+        Initialize Speech Service with Azure credentials.
+        
+        Args:
+            detailed: Request Detailed output so segments carry confidence scores
+        """
+        config = get_config()
         self.speech_config = speechsdk.SpeechConfig(
             subscription=config.settings.speech_key,
-            region=config.settings.speech_region
+            region=config.settings.speech_region,
+            speech_recognition_language="en-US"
         )
         
-        # Configure for optimal quality
-        self.speech_config.speech_recognition_language = "en-US"
-        self.speech_config.set_property(
-            speechsdk.PropertyId.SpeechServiceResponse_RequestSentenceBoundary,
-            "true"
-        )
+        # Configure for optimal quality; extra properties are applied in one call
+        self.speech_config.set_properties(RECOGNITION_PROPERTIES)
         
-        # Enable detailed output
-        self.speech_config.output_format = speechsdk.OutputFormat.Detailed
+        # Detailed output adds N-best alternatives to every event; only request
+        # it when segment confidence is needed
+        self._detailed = detailed
+        if detailed:
+            self.speech_config.output_format = speechsdk.OutputFormat.Detailed
         
         self.recognizer: Optional[speechsdk.SpeechRecognizer] = None
-        self.segments: List[TranscriptSegment] = []
-        self.full_transcript: str = ""
+        self.segments: Deque[TranscriptSegment] = deque()
+        # Recognized phrases; joined on demand instead of growing one string
+        self._transcript_parts: List[str] = []
         self.is_recognizing: bool = False
         self.start_time: float = 0
         
+        # Push-stream ingress state (see start_continuous_recognition_from_stream)
+        self._push_stream: Optional[speechsdk.audio.PushAudioInputStream] = None
+        self._pump_task: Optional[asyncio.Task] = None
+        self._restart_requested: bool = False
+        self._offset_base: float = 0
+        
+        # Microphone input for the continuous recognizer is opened once; the
+        # recognizer keeps its event handlers across sessions
+        self._mic_audio_config: Optional[speechsdk.audio.AudioConfig] = None
+        self._mic_recognizer: Optional[speechsdk.SpeechRecognizer] = None
+        
+        # Reused by recognize_from_microphone_async
+        self._once_recognizer: Optional[speechsdk.SpeechRecognizer] = None
+        self._once_lock = asyncio.Lock()
+        
         # Callbacks
         self.on_partial_result: Optional[Callable[[str], None]] = None
         self.on_final_result: Optional[Callable[[str], None]] = None
         self.on_error: Optional[Callable[[str], None]] = None
     
-    def _setup_recognizer(self):
-        """Set up speech recognizer with event handlers."""
-        # Use default microphone
-        audio_config = speechsdk.AudioConfig(use_default_microphone=True)
+    @property
+    def full_transcript(self) -> str:
+        """Accumulated transcript of all recognized phrases."""
+        # Blank phrases are never appended, so the join needs no strip
+        return " ".join(self._transcript_parts)
+    
+    def _get_mic_audio_config(self) -> speechsdk.audio.AudioConfig:
+        """Return the continuous recognizer's microphone AudioConfig, creating it on first use."""
+        if self._mic_audio_config is None:
+            self._mic_audio_config = speechsdk.AudioConfig(use_default_microphone=True)
+        return self._mic_audio_config
+    
+    def _setup_recognizer(self, audio_config: Optional[speechsdk.audio.AudioConfig] = None):
+        """
+        Set up speech recognizer with event handlers.
+        
+        Args:
+            audio_config: Audio input; defaults to the default microphone
+        """
+        if audio_config is None:
+            audio_config = self._get_mic_audio_config()
         
         self.recognizer = speechsdk.SpeechRecognizer(
             speech_config=self.speech_config,
@@ -65,9 +114,14 @@ class SpeechService:
     
     def _on_recognizing(self, evt: speechsdk.SpeechRecognitionEventArgs):
         """Handle interim recognition results."""
+        # Partials arrive many times per second; skip reading the text when
+        # nobody consumes it
+        if self.on_partial_result is None and not logger.isEnabledFor(logging.DEBUG):
+            return
+        
         if evt.result.reason == speechsdk.ResultReason.RecognizingSpeech:
             text = evt.result.text
-            logger.debug(f"Recognizing: {text}")
+            logger.debug("Recognizing: %s", text)
             
             # Callback for partial results (optional real-time display)
             if self.on_partial_result:
@@ -78,13 +132,13 @@ class SpeechService:
         if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
             text = evt.result.text
             
-            if text.strip():  # Only process non-empty results
+            if text and not text.isspace():  # Only process non-empty results
                 # Calculate timestamp
-                offset_seconds = evt.result.offset / 10_000_000  # Convert from ticks
+                offset_seconds = self._offset_base + evt.result.offset / 10_000_000  # Convert from ticks
                 
                 # Get confidence score if available
                 confidence = None
-                if hasattr(evt.result, 'best') and evt.result.best:
+                if self._detailed and hasattr(evt.result, 'best') and evt.result.best:
                     confidence = evt.result.best[0].confidence if evt.result.best else None
                 
                 # Store segment
@@ -96,7 +150,7 @@ class SpeechService:
                 self.segments.append(segment)
                 
                 # Append to full transcript
-                self.full_transcript += text + " "
+                self._transcript_parts.append(text)
                 
                 logger.info(f"Recognized: {text}")
                 
@@ -111,8 +165,7 @@ class SpeechService:
         """Handle session start."""
         logger.info("Speech recognition session started")
         self.is_recognizing = True
-        import time
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
     
     def _on_session_stopped(self, evt: speechsdk.SessionEventArgs):
         """Handle session stop."""
@@ -127,28 +180,154 @@ class SpeechService:
             error_msg = f"Error: {evt.error_details}"
             logger.error(error_msg)
             
+            # Audio pushed faster than the service consumes it overflows the
+            # client buffer; the pump task recreates the recognizer and resumes
+            pumping = self._pump_task is not None and not self._pump_task.done()
+            if pumping and "buffer" in (evt.error_details or "").lower():
+                self._restart_requested = True
+                self.is_recognizing = False
+                return
+            
             if self.on_error:
                 self.on_error(error_msg)
         
         self.is_recognizing = False
     
-    def start_continuous_recognition(self):
+    def _reset_state(self, max_segments: Optional[int]):
+        """
+        Clear results from a previous recognition run.
+        
+        Args:
+            max_segments: Keep only the most recent segments (None = unbounded)
+        """
+        self.segments = deque(maxlen=max_segments)
+        self._transcript_parts = []
+        self._offset_base = 0
+    
+    def start_continuous_recognition(self, max_segments: Optional[int] = None):
         """
         Start continuous speech recognition.
         Accumulates transcript until stop_continuous_recognition is called.
+        
+        Args:
+            max_segments: Keep only the most recent segments so a session that is
+                never stopped cannot grow without bound (None = unbounded)
         """
         logger.info("Starting continuous speech recognition")
         
-        # Reset state
-        self.segments = []
-        self.full_transcript = ""
+        self._reset_state(max_segments)
+        self._pump_task = None
         
-        # Setup and start recognizer
-        self._setup_recognizer()
+        # Reuse the microphone recognizer from earlier sessions
+        if self._mic_recognizer is None:
+            self._setup_recognizer()
+            self._mic_recognizer = self.recognizer
+        self.recognizer = self._mic_recognizer
         self.recognizer.start_continuous_recognition()
         
         logger.info("Listening... Speak into your microphone")
     
+    def _start_push_recognizer(self):
+        """Create a fresh push stream and recognizer and start recognition."""
+        stream_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=PCM_SAMPLES_PER_SECOND,
+            bits_per_sample=16,
+            channels=1
+        )
+        self._push_stream = speechsdk.audio.PushAudioInputStream(stream_format)
+        self._setup_recognizer(speechsdk.audio.AudioConfig(stream=self._push_stream))
+        self.recognizer.start_continuous_recognition()
+    
+    def _teardown_push_recognizer(self):
+        """Stop the current push recognizer, disconnect its handlers and close its stream."""
+        self.recognizer.stop_continuous_recognition()
+        for signal in (
+            self.recognizer.recognizing,
+            self.recognizer.recognized,
+            self.recognizer.session_started,
+            self.recognizer.session_stopped,
+            self.recognizer.canceled,
+        ):
+            signal.disconnect_all()
+        self._push_stream.close()
+    
+    async def start_continuous_recognition_from_stream(
+        self,
+        pcm_iter: AsyncIterator[bytes],
+        max_segments: Optional[int] = None
+    ):
+        """
+        Start continuous recognition over pushed PCM audio instead of the microphone.
+        
+        Audio is written no faster than real time so the SDK's client buffer
+        cannot overflow on pre-recorded input. If it does overflow anyway, the
+        recognizer is recreated and recognition resumes at the current position.
+        Call stop_continuous_recognition_from_stream to finish.
+        
+        Args:
+            pcm_iter: Async iterator of 16 kHz, 16-bit mono PCM chunks
+            max_segments: Keep only the most recent segments (None = unbounded)
+        """
+        logger.info("Starting continuous speech recognition from audio stream")
+        
+        self._reset_state(max_segments)
+        self._restart_requested = False
+        
+        # Starting recognition blocks on the SDK; keep it off the event loop
+        await asyncio.to_thread(self._start_push_recognizer)
+        self._pump_task = asyncio.create_task(self._pump_audio(pcm_iter))
+    
+    async def _pump_audio(self, pcm_iter: AsyncIterator[bytes]):
+        """
+        Write audio chunks to the push stream, paced to at most 1x real time.
+        
+        Args:
+            pcm_iter: Async iterator of PCM chunks
+        """
+        bytes_sent = 0
+        started = time.monotonic()
+        try:
+            async for chunk in pcm_iter:
+                if self._restart_requested:
+                    logger.warning("Audio buffer overflow, restarting recognizer")
+                    self._restart_requested = False
+                    await asyncio.to_thread(self._teardown_push_recognizer)
+                    self._offset_base = bytes_sent / PCM_BYTES_PER_SECOND
+                    await asyncio.to_thread(self._start_push_recognizer)
+                
+                self._push_stream.write(chunk)
+                bytes_sent += len(chunk)
+                
+                # Sleep until wall time catches up with the audio written so far
+                ahead = bytes_sent / PCM_BYTES_PER_SECOND - (time.monotonic() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+        finally:
+            # Closing signals end of stream so the last phrase is finalized
+            self._push_stream.close()
+    
+    async def stop_continuous_recognition_from_stream(self) -> tuple[str, List[TranscriptSegment], float]:
+        """
+        Stop push-stream recognition and return accumulated transcript.
+        
+        The pump task is cancelled and awaited first, so the push stream is
+        closed before the recognizer stops.
+        
+        Returns:
+            tuple: (full_transcript, segments, duration_seconds)
+        """
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Audio stream ended with an error: {e}")
+            self._pump_task = None
+        
+        return await asyncio.to_thread(self.stop_continuous_recognition)
+    
     def stop_continuous_recognition(self) -> tuple[str, List[TranscriptSegment], float]:
         """
         Stop continuous speech recognition and return accumulated transcript.
@@ -158,20 +337,24 @@ class SpeechService:
         """
         logger.info("Stopping continuous speech recognition")
         
+        # Push-stream sessions should use stop_continuous_recognition_from_stream,
+        # which waits for the pump; this is a fallback that cannot wait
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            self._pump_task = None
+        
         if self.recognizer:
             self.recognizer.stop_continuous_recognition()
         
-        import time
-        duration = time.time() - self.start_time if self.start_time else 0
+        duration = time.monotonic() - self.start_time if self.start_time else 0
         
-        # Clean up transcript
-        transcript = self.full_transcript.strip()
+        transcript = self.full_transcript
         
         logger.info(f"Recognition complete. Transcript length: {len(transcript)} characters")
         logger.info(f"Duration: {duration:.2f} seconds")
         logger.info(f"Segments captured: {len(self.segments)}")
         
-        return transcript, self.segments, duration
+        return transcript, list(self.segments), duration
     
     async def recognize_from_microphone_async(self) -> str:
         """
@@ -181,20 +364,24 @@ class SpeechService:
         Returns:
             str: Recognized text
         """
-        audio_config = speechsdk.AudioConfig(use_default_microphone=True)
-        recognizer = speechsdk.SpeechRecognizer(
-            speech_config=self.speech_config,
-            audio_config=audio_config
-        )
-        
-        logger.info("Listening for speech...")
+        # The microphone is already held by the continuous recognizer
+        if self.is_recognizing and self.recognizer is self._mic_recognizer:
+            raise RuntimeError("Continuous recognition is active; stop it before one-time recognition")
         
-        # Run recognition in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            recognizer.recognize_once
-        )
+        # One recognizer is reused across calls; the lock serializes them since
+        # there is only one microphone to listen on. It gets its own AudioConfig
+        # rather than sharing the continuous recognizer's.
+        async with self._once_lock:
+            if self._once_recognizer is None:
+                self._once_recognizer = speechsdk.SpeechRecognizer(
+                    speech_config=self.speech_config,
+                    audio_config=speechsdk.AudioConfig(use_default_microphone=True)
+                )
+            
+            logger.info("Listening for speech...")
+            
+            # Run recognition in a worker thread to avoid blocking
+            result = await asyncio.to_thread(self._once_recognizer.recognize_once)
         
         if result.reason == speechsdk.ResultReason.RecognizedSpeech:
             logger.info(f"Recognized: {result.text}")
@@ -213,4 +400,4 @@ class SpeechService:
     
     def get_current_transcript(self) -> str:
         """Get the current accumulated transcript without stopping recognition."""
-        return self.full_transcript.strip()
+        return self.full_transcript
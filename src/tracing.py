@@ -1,6 +1,7 @@
 """
 OpenTelemetry tracing configuration for Application Insights.
 """
+import asyncio
 import logging
 from typing import Optional
 from azure.monitor.opentelemetry import configure_azure_monitor
@@ -9,6 +10,9 @@ from opentelemetry import trace
 
 logger = logging.getLogger(__name__)
 
+# Set once tracing is configured; instrumented functions skip span creation until then
+_TRACING_ENABLED = False
+
 
 class TracingConfig:
     """Configure distributed tracing for the application."""
@@ -30,6 +34,8 @@ class TracingConfig:
         Args:
             app: FastAPI application instance to instrument
         """
+        global _TRACING_ENABLED
+        
         if not self.connection_string:
             logger.warning("Application Insights connection string not provided. Tracing disabled.")
             return
@@ -46,6 +52,7 @@ class TracingConfig:
                 FastAPIInstrumentor.instrument_app(app)
             
             self.is_configured = True
+            _TRACING_ENABLED = True
             logger.info("OpenTelemetry tracing configured with Application Insights")
             
         except Exception as e:
@@ -74,16 +81,21 @@ def instrument_function(tracer, span_name: str):
         span_name: Name for the trace span
     """
     def decorator(func):
+        start_span = tracer.start_as_current_span
+        
         async def async_wrapper(*args, **kwargs):
-            with tracer.start_as_current_span(span_name):
+            if not _TRACING_ENABLED:
+                return await func(*args, **kwargs)
+            with start_span(span_name):
                 return await func(*args, **kwargs)
         
         def sync_wrapper(*args, **kwargs):
-            with tracer.start_as_current_span(span_name):
+            if not _TRACING_ENABLED:
+                return func(*args, **kwargs)
+            with start_span(span_name):
                 return func(*args, **kwargs)
         
         # Return appropriate wrapper based on function type
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
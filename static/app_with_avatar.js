@@ -27,6 +27,9 @@ let shouldRestartRecognition = true;  // Control auto-restart of recognition
 let currentUtterance = "";  // Track current speaking segment
 let recentAvatarSpeech = [];  // Track recent avatar utterances to filter feedback
 let avatarSpeechEndTime = 0;  // Track when avatar finished speaking
+let pendingAvatarUtterances = 0;  // Sentences queued on the avatar synthesizer
+let playbackEndTimer = null;  // Waits for queued audio to finish playing
+let micRestartTimer = null;  // Extra buffer before the mic is re-enabled
 
 // Speech Recognition setup
 let recognition = null;
@@ -406,7 +409,8 @@ function setupInteractiveWebSocket() {
         const message = JSON.parse(event.data);
         console.log('WebSocket message:', message);
         
-        if (message.type === 'avatar_speak') {
+        // Replies arrive sentence by sentence (avatar_speak_partial) while they are generated
+        if (message.type === 'avatar_speak' || message.type === 'avatar_speak_partial') {
             // Set flag IMMEDIATELY before any processing to block speech recognition
             avatarIsSpeaking = true;
             console.log('Avatar about to speak - blocking mic input');
@@ -501,19 +505,40 @@ function speakToAvatar(text) {
         recognition.stop();
     }
     
+    // A new sentence arrived: cancel any pending mic re-enable from the previous one
+    clearTimeout(playbackEndTimer);
+    clearTimeout(micRestartTimer);
+    playbackEndTimer = null;
+    micRestartTimer = null;
+    
+    pendingAvatarUtterances++;
     avatarSynthesizer.speakTextAsync(text).then((result) => {
+        // More sentences are queued - keep the mic blocked until the last one
+        pendingAvatarUtterances = Math.max(0, pendingAvatarUtterances - 1);
+        if (pendingAvatarUtterances > 0) {
+            return;
+        }
+        
         if (result.reason === SpeechSDK.ResultReason.SynthesizingAudioCompleted) {
             console.log("Avatar speech completed - waiting for audio playback to finish");
             // INCREASED BUFFER: Wait longer for audio to fully finish playing
             // The synthesizer completes before audio finishes playing through speakers
-            setTimeout(() => {
+            playbackEndTimer = setTimeout(() => {
+                playbackEndTimer = null;
+                if (pendingAvatarUtterances !== 0) {
+                    return;  // Another sentence started in the meantime
+                }
                 avatarIsSpeaking = false;
                 avatarSpeechEndTime = Date.now();  // Track when avatar finished
                 updateAvatarStatus('👂 Listening...');
                 console.log('Avatar audio playback complete - restarting mic in 1 second');
                 
                 // Add another delay before actually restarting to ensure audio is fully done
-                setTimeout(() => {
+                micRestartTimer = setTimeout(() => {
+                    micRestartTimer = null;
+                    if (pendingAvatarUtterances !== 0) {
+                        return;  // Another sentence started in the meantime
+                    }
                     shouldRestartRecognition = true;  // Re-enable auto-restart
                     if (isRecording && recognition) {
                         console.log('✅ Restarting speech recognition');
@@ -532,6 +557,10 @@ function speakToAvatar(text) {
         }
     }).catch((error) => {
         console.error("Avatar speech error:", error);
+        pendingAvatarUtterances = Math.max(0, pendingAvatarUtterances - 1);
+        if (pendingAvatarUtterances > 0) {
+            return;
+        }
         avatarIsSpeaking = false;
         shouldRestartRecognition = true;
         updateAvatarStatus('👂 Listening...');